@@ -57,26 +57,26 @@ class ScheduleMonitor:
         
         current_minutes = self._get_current_minutes()
         
-        # Sort schedules by time
-        sorted_schedules = []
+        # Single pass: the most recent schedule that has passed, and the latest one overall
+        # (no sorted copy - sorting (minutes, dict) pairs also fails when two share a time)
+        active_schedule = None
+        active_minutes = -1
+        last_schedule = None
+        last_minutes = -1
         for schedule in schedules:
             schedule_minutes = self._parse_time(schedule['time'])
-            if schedule_minutes is not None:
-                sorted_schedules.append((schedule_minutes, schedule))
-        
-        sorted_schedules.sort()
-        
-        # Find the most recent schedule that has passed
-        active_schedule = None
-        for schedule_minutes, schedule in sorted_schedules:
-            if current_minutes >= schedule_minutes:
+            if schedule_minutes is None:
+                continue
+            if active_minutes < schedule_minutes <= current_minutes:
                 active_schedule = schedule
-            else:
-                break
+                active_minutes = schedule_minutes
+            if schedule_minutes > last_minutes:
+                last_schedule = schedule
+                last_minutes = schedule_minutes
         
         # If no schedule found (before first schedule), use last schedule from yesterday
-        if active_schedule is None and sorted_schedules:
-            active_schedule = sorted_schedules[-1][1]
+        if active_schedule is None:
+            active_schedule = last_schedule
         
         return active_schedule
 
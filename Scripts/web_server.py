@@ -1,15 +1,1138 @@
 import socket
+import select
+import sys
+import os
+import binascii
+import gc # type: ignore
 import time # type: ignore
-import json
+try:
+    import ujson as json # type: ignore
+except ImportError:
+    import json
+try:
+    from micropython import const # type: ignore
+except ImportError:
+    def const(x): return x
 import scripts.discord_webhook as discord_webhook
 
+# Per-request DEBUG lines (each is blocking UART/USB output). A const(0) underscore name is
+# inlined by the MicroPython compiler, so `if _DEBUG:` blocks are dropped from the bytecode.
+_DEBUG = const(0)
+
+# Pre-encoded response headers (%d = Content-Length)
+_HDR_HTML = b'HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\nContent-Length: %d\r\n'
+_HDR_CLOSE = b'Connection: close\r\n\r\n'
+_HDR_JS = b'HTTP/1.1 200 OK\r\nContent-Type: application/javascript; charset=utf-8\r\nContent-Length: %d\r\nCache-Control: max-age=300\r\nConnection: close\r\n\r\n'
+_HDR_STATE = b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nContent-Length: %d\r\nCache-Control: no-store\r\nConnection: close\r\n\r\n'
+_STATE_JSON = '{"in":"%s","out":"%s","heat":%d,"ac":%d,"ht":"%s","hs":"%s","act":"%s","acs":"%s","time":"%s","v":"%s"}'
+_PAYLOAD_TOO_LARGE = b'HTTP/1.1 413 Payload Too Large\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+_BAD_REQUEST = b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+_PING_PREFIX = b'GET /ping '  # Request line start that is answered before the rest arrives
+_PING_RESPONSE = b'HTTP/1.1 200 OK\r\nContent-Type: text/plain\r\nContent-Length: 2\r\nConnection: close\r\n\r\nOK'
+_REDIRECT_303_ROOT = b'HTTP/1.1 303 See Other\r\nLocation: /\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+_REDIRECT_303_ROOT_NOCACHE = (b'HTTP/1.1 303 See Other\r\nLocation: /\r\nContent-Length: 0\r\nConnection: close\r\n'
+                              b'Cache-Control: no-cache, no-store, must-revalidate\r\nPragma: no-cache\r\nExpires: 0\r\n\r\n')
+_REDIRECT_303_SCHEDULE = b'HTTP/1.1 303 See Other\r\nLocation: /schedule\r\nContent-Length: 0\r\nConnection: close\r\n\r\n'
+_NO_CONTENT = b'HTTP/1.1 204 No Content\r\nConnection: close\r\n\r\n'
+_NOT_MODIFIED = 'HTTP/1.1 304 Not Modified\r\nETag: %s\r\nConnection: close\r\n\r\n'
+
+# HEAD answers by path (static assets use their own headers); generated bodies are not rendered, so no Content-Length
+_HDR_HEAD_HTML = _HDR_HTML.replace(b'Content-Length: %d\r\n', b'') + _HDR_CLOSE
+_HEAD_HEADERS = {
+    b'/sched.js': _HDR_JS.replace(b'Content-Length: %d\r\n', b''),
+    b'/state.json': _HDR_STATE.replace(b'Content-Length: %d\r\n', b''),
+    b'/ping': _PING_RESPONSE[:-2],  # Fixed body b'OK'
+    b'/favicon.ico': _NO_CONTENT,
+}
+
+_RECV_MAX = 8192  # Largest request the receive buffer may grow to (headers + form body)
+
+# Disable Nagle on client sockets where the port supports it (small response + close)
+_TCP_NODELAY = getattr(socket, 'TCP_NODELAY', None)
+_IPPROTO_TCP = getattr(socket, 'IPPROTO_TCP', 6)
+
+# Dashboard stylesheet, served from /style.css and cached by the browser
+_CSS_BYTES = b"""* { margin: 0; padding: 0; box-sizing: border-box; }
+body {
+    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
+    max-width: 1200px;
+    margin: 0 auto;
+    padding: 20px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+}
+h1 {
+    color: white;
+    text-align: center;
+    font-size: 36px;
+    margin-bottom: 30px;
+    text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
+}
+.temp-grid {
+    display: grid;
+    grid-template-columns: repeat(2, 1fr);
+    gap: 20px;
+    margin-bottom: 20px;
+}
+.card {
+    background: white;
+    border-radius: 15px;
+    padding: 25px;
+    box-shadow: 0 8px 16px rgba(0,0,0,0.2);
+    transition: transform 0.2s;
+}
+.card:hover { transform: translateY(-5px); }
+.card.full-width { margin: 15px 0; }
+.temp-icon { font-size: 64px; text-align: center; margin-bottom: 15px; }
+.temp-display {
+    font-size: 56px;
+    font-weight: bold;
+    text-align: center;
+    margin: 15px 0;
+    font-family: 'Courier New', monospace;
+}
+.inside { color: #e74c3c; text-shadow: 2px 2px 4px rgba(231, 76, 60, 0.3); }
+.outside { color: #3498db; text-shadow: 2px 2px 4px rgba(52, 152, 219, 0.3); }
+.label {
+    font-size: 20px;
+    color: #34495e;
+    text-align: center;
+    margin-bottom: 10px;
+    font-weight: 600;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}
+.status {
+    display: flex;
+    justify-content: space-around;
+    margin-top: 20px;
+    flex-wrap: wrap;
+    gap: 20px;
+}
+.status-item { text-align: center; flex: 1; min-width: 200px; }
+.status-icon { font-size: 48px; margin-bottom: 10px; }
+.status-indicator {
+    font-size: 22px;
+    font-weight: bold;
+    padding: 15px 30px;
+    border-radius: 25px;
+    display: inline-block;
+    margin-top: 10px;
+    text-transform: uppercase;
+    letter-spacing: 2px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+    transition: all 0.3s;
+}
+.status-indicator:hover { transform: scale(1.05); }
+.on {
+    background: linear-gradient(135deg, #2ecc71, #27ae60);
+    color: white;
+    animation: pulse 2s infinite;
+}
+.off { background: linear-gradient(135deg, #95a5a6, #7f8c8d); color: white; }
+@keyframes pulse { 0%, 100% { opacity: 1; } 50% { opacity: 0.8; } }
+.controls {
+    margin-top: 20px;
+    padding: 20px;
+    background: #f8f9fa;
+    border-radius: 10px;
+}
+.control-group { margin: 15px 0; }
+.control-label {
+    display: block;
+    font-size: 16px;
+    font-weight: 600;
+    color: #34495e;
+    margin-bottom: 8px;
+}
+input[type="number"], input[type="time"], input[type="text"] {
+    width: 100%;
+    padding: 12px;
+    font-size: 18px;
+    border: 2px solid #ddd;
+    border-radius: 8px;
+    transition: border-color 0.3s;
+}
+input[type="number"]:focus, input[type="time"]:focus, input[type="text"]:focus {
+    outline: none;
+    border-color: #667eea;
+}
+.btn {
+    width: 100%;
+    padding: 15px;
+    font-size: 18px;
+    font-weight: bold;
+    color: white;
+    background: linear-gradient(135deg, #667eea, #764ba2);
+    border: none;
+    border-radius: 10px;
+    cursor: pointer;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+    transition: transform 0.2s;
+}
+.btn:hover { transform: translateY(-2px); }
+.btn:active { transform: translateY(0); }
+.success-message {
+    background: #2ecc71;
+    color: white;
+    padding: 15px;
+    border-radius: 10px;
+    text-align: center;
+    font-weight: bold;
+    margin-bottom: 20px;
+    animation: fadeIn 0.5s;
+}
+@keyframes fadeIn { from { opacity: 0; } to { opacity: 1; } }
+.footer {
+    text-align: center;
+    color: white;
+    margin-top: 30px;
+    font-size: 14px;
+    text-shadow: 1px 1px 2px rgba(0,0,0,0.2);
+}
+.targets {
+    font-size: 15px;
+    color: #7f8c8d;
+    text-align: center;
+    margin-top: 12px;
+    font-weight: 500;
+}
+.degree { font-size: 0.6em; vertical-align: super; }
+.schedule-row {
+    display: grid;
+    grid-template-columns: 1fr 2fr 1fr 1fr;
+    gap: 10px;
+    margin-bottom: 15px;
+    padding: 15px;
+    background: white;
+    border-radius: 8px;
+}
+.toggle-switch {
+    position: relative;
+    display: inline-block;
+    width: 60px;
+    height: 34px;
+}
+.toggle-switch input { opacity: 0; width: 0; height: 0; }
+.slider {
+    position: absolute;
+    cursor: pointer;
+    top: 0;
+    left: 0;
+    right: 0;
+    bottom: 0;
+    background-color: #ccc;
+    transition: .4s;
+    border-radius: 34px;
+}
+.slider:before {
+    position: absolute;
+    content: "";
+    height: 26px;
+    width: 26px;
+    left: 4px;
+    bottom: 4px;
+    background-color: white;
+    transition: .4s;
+    border-radius: 50%;
+}
+input:checked + .slider { background-color: #2ecc71; }
+input:checked + .slider:before { transform: translateX(26px); }
+.sched-card { background: #f8f9fa; padding: 15px; border-radius: 8px; }
+.sched-card-title { font-weight: bold; color: #34495e; margin-bottom: 5px; }
+.sched-card-temps { color: #7f8c8d; font-size: 14px; }
+.mode-form { margin: 20px 0; }
+.mode-auto {
+    background: linear-gradient(135deg, #2ecc71, #27ae60);
+    color: white;
+    padding: 15px;
+    border-radius: 10px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+.mode-title { font-weight: bold; font-size: 18px; margin-bottom: 5px; }
+.mode-sub { font-size: 14px; opacity: 0.9; margin-bottom: 10px; }
+.mode-note { font-size: 13px; opacity: 0.8; }
+@media (max-width: 768px) {
+    .temp-grid { grid-template-columns: 1fr; }
+    .status { flex-direction: column; }
+    .schedule-row { grid-template-columns: 1fr; }
+}
+"""
+
+# Error page stylesheet (/error.css)
+_ERROR_CSS_BYTES = b"""body {
+    font-family: Arial, sans-serif;
+    max-width: 800px;
+    margin: 40px auto;
+    padding: 20px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+}
+.container {
+    background: white;
+    border-radius: 15px;
+    padding: 30px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+}
+.error-banner {
+    background: linear-gradient(135deg, #e74c3c, #c0392b);
+    color: white;
+    padding: 20px;
+    border-radius: 10px;
+    text-align: center;
+    font-weight: bold;
+    margin-bottom: 20px;
+    box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+}
+.error-title {
+    font-size: 24px;
+    margin-bottom: 10px;
+}
+.error-message {
+    font-size: 16px;
+    line-height: 1.5;
+}
+.btn {
+    background: linear-gradient(135deg, #3498db, #2980b9);
+    color: white;
+    padding: 12px 24px;
+    border: none;
+    border-radius: 8px;
+    cursor: pointer;
+    font-size: 16px;
+    font-weight: bold;
+    text-decoration: none;
+    display: inline-block;
+    margin-top: 20px;
+}
+.btn:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 12px rgba(52, 152, 219, 0.4);
+}
+.status-grid {
+    display: grid;
+    grid-template-columns: repeat(2, 1fr);
+    gap: 15px;
+    margin-top: 20px;
+}
+.status-card {
+    background: #f8f9fa;
+    padding: 15px;
+    border-radius: 8px;
+    text-align: center;
+}
+"""
+
+# Layout shared by the schedule editor and settings pages (each stylesheet adds its body width)
+_FORM_PAGE_CSS_BYTES = b"""body {
+    font-family: Arial, sans-serif;
+    margin: 0 auto;
+    padding: 20px;
+    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+    min-height: 100vh;
+}
+.container {
+    background: white;
+    border-radius: 15px;
+    padding: 30px;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.3);
+}
+h1 {
+    color: #2c3e50;
+    text-align: center;
+    margin-bottom: 20px;
+}
+.header-info {
+    display: flex;
+    justify-content: center;
+    gap: 30px;
+    margin-bottom: 30px;
+    padding: 15px;
+    background: #f8f9fa;
+    border-radius: 10px;
+}
+.btn {
+    padding: 12px 24px;
+    background: linear-gradient(135deg, #667eea, #764ba2);
+    color: white;
+    border: none;
+    border-radius: 8px;
+    font-weight: bold;
+    cursor: pointer;
+    font-size: 16px;
+    text-decoration: none;
+    display: inline-block;
+}
+.btn:hover { transform: translateY(-2px); }
+"""
+
+# Schedule editor stylesheet (/schedule.css)
+_SCHED_CSS_BYTES = _FORM_PAGE_CSS_BYTES + b""".sched {
+    background: #f8f9fa;
+    padding: 20px;
+    border-radius: 10px;
+    margin-bottom: 15px;
+    border: 2px solid #ddd;
+}
+.sched h3 {
+    color: #34495e;
+    margin-bottom: 15px;
+}
+.sched label {
+    display: block;
+    margin: 10px 0 5px 0;
+    font-weight: bold;
+    color: #555;
+}
+.sched input {
+    width: 100%;
+    padding: 8px;
+    border: 1px solid #ddd;
+    border-radius: 4px;
+    margin-bottom: 10px;
+}
+body { max-width: 1000px; }
+"""
+
+# Dashboard live update: polls /state.json and patches the page in place; reloads when
+# something it cannot patch (mode, schedules, hold countdown, config) has changed
+_DASH_JS = b"""(function(){
+function $(i){return document.getElementById(i);}
+function st(i,on){var e=$(i);if(e){e.className='status-indicator '+(on?'on':'off');e.textContent=on?'ON':'OFF';}}
+function tg(i,t,w){var e=$(i);if(e){e.textContent='Target: '+t+'\\u00b0F \\u00b1 '+w+'\\u00b0F';}}
+function tx(i,v){var e=$(i);if(e){e.firstChild.nodeValue=v;}}
+function tick(){
+fetch('/state.json',{cache:'no-store'}).then(function(r){return r.json();}).then(function(s){
+var f=$('st');if(f&&f.getAttribute('data-v')!==s.v){location.reload();return;}
+tx('t-in',s['in']);tx('t-out',s.out);st('s-heat',s.heat);st('s-ac',s.ac);
+tg('g-heat',s.ht,s.hs);tg('g-ac',s.act,s.acs);tx('ts',s.time);
+}).catch(function(){});
+}
+setInterval(tick,30000);
+})();
+"""
+
+def _gzip(data):
+    """Gzip `data` (done once at import); None if this build has no compressor."""
+    try:
+        import deflate, io  # type: ignore  # MicroPython >= 1.21 built with deflate compression
+        buf = io.BytesIO()
+        f = deflate.DeflateIO(buf, deflate.GZIP)
+        f.write(data)
+        f.close()
+        return buf.getvalue()
+    except Exception:
+        pass
+    try:
+        import gzip  # CPython (desk testing)
+        return gzip.compress(data, 9, mtime=0)
+    except Exception:
+        return None
+
+def _static_file(body, ctype):
+    """Pre-build (header, body, tag, gz_header, gz_body) for a cacheable asset; tag is its ETag and URL version.
+
+    gz_header/gz_body are None when gzip is unavailable or would not shrink the body.
+    """
+    tag = '{:08x}'.format(binascii.crc32(body) & 0xffffffff)  # Not hash(): 8-16 bits wide on MicroPython
+    fmt = ('HTTP/1.1 200 OK\r\nContent-Type: {}\r\nContent-Length: {}\r\n{}ETag: "{}"\r\nVary: Accept-Encoding\r\n'
+           'Cache-Control: public, max-age=31536000, immutable\r\nConnection: close\r\n\r\n')
+    header = fmt.format(ctype, len(body), '', tag).encode('utf-8')
+    gz_body = _gzip(body)
+    if gz_body is None or len(gz_body) >= len(body):
+        return header, body, tag, None, None
+    gz_header = fmt.format(ctype, len(gz_body), 'Content-Encoding: gzip\r\n', tag + '-gz').encode('utf-8')
+    return header, body, tag, gz_header, gz_body
+
+# Advanced settings page stylesheet (/settings.css)
+_SETTINGS_CSS_BYTES = _FORM_PAGE_CSS_BYTES + b"""body { max-width: 900px; }
+.setting-group {
+    background: #f8f9fa;
+    padding: 20px;
+    border-radius: 10px;
+    margin-bottom: 20px;
+}
+.setting-group h3 {
+    color: #34495e;
+    margin-bottom: 15px;
+}
+label {
+    display: block;
+    margin: 15px 0 5px 0;
+    font-weight: bold;
+    color: #555;
+}
+input[type="number"] {
+    width: 100%;
+    padding: 10px;
+    border: 2px solid #ddd;
+    border-radius: 6px;
+    font-size: 16px;
+}
+input[type="number"]:focus {
+    border-color: #667eea;
+    outline: none;
+}
+.btn { width: 100%; }
+.btn-secondary {
+    background: linear-gradient(135deg, #95a5a6, #7f8c8d);
+    margin-top: 10px;
+}
+.info-box {
+    background: #e8f4f8;
+    border-left: 4px solid #3498db;
+    padding: 15px;
+    margin: 20px 0;
+    border-radius: 4px;
+}
+"""
+
+# Static assets by path; pages link them as <path>?v=<tag> so a new build busts the cache
+_STATIC_FILES = {
+    b'/style.css': _static_file(_CSS_BYTES, 'text/css'),
+    b'/error.css': _static_file(_ERROR_CSS_BYTES, 'text/css'),
+    b'/schedule.css': _static_file(_SCHED_CSS_BYTES, 'text/css'),
+    b'/settings.css': _static_file(_SETTINGS_CSS_BYTES, 'text/css'),
+    b'/dash.js': _static_file(_DASH_JS, 'application/javascript; charset=utf-8'),
+}
+
+# Shared page skeleton: every template is _page_head(...) + body + _PAGE_FOOT
+_PAGE_FOOT = """
+</body>
+</html>
+"""
+
+def _page_head(title, css, refresh=0):
+    """Common <head> for all pages, linking the current version of static stylesheet `css`."""
+    return """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{}</title>
+    <meta name="viewport" content="width=device-width, initial-scale=1">
+{}    <meta charset="utf-8">
+    <link rel="stylesheet" href="{}?v={}">
+</head>
+<body>""".format(title, '    <noscript><meta http-equiv="refresh" content="{}"></noscript>\n'.format(refresh) if refresh else '',
+                 css.decode('utf-8'), _STATIC_FILES[css][2])
+
+# Dashboard page template (split into _STATUS_PARTS at import; streamed by _get_status_page)
+_STATUS_TEMPLATE = _page_head('🌱 Auto Garden', b'/style.css', refresh=30) + """
+    <h1>🌱 Auto Garden Dashboard</h1>
+    
+    {hold_banner}
+    {success_message}
+    
+    <div class="temp-grid">
+        <div class="card temp-card">
+            <div class="temp-icon">🏠</div>
+            <div class="label">Indoor Climate</div>
+            <div class="temp-display inside" id="t-in">{inside_temp}<span class="degree">°F</span></div>
+        </div>
+        
+        <div class="card temp-card">
+            <div class="temp-icon">🌤️</div>
+            <div class="label">Outdoor Climate</div>
+            <div class="temp-display outside" id="t-out">{outside_temp}<span class="degree">°F</span></div>
+        </div>
+    </div>
+    
+    <div class="card full-width">
+        <div class="status">
+            <!-- ===== HEATER FIRST (LEFT) ===== -->
+            <div class="status-item">
+                <div class="status-icon">🔥</div>
+                <div class="label">Heating System</div>
+                <div class="status-indicator {heater_class}" id="s-heat">{heater_status}</div>
+                <div class="targets" id="g-heat">Target: {heater_target}°F ± {heater_swing}°F</div>
+            </div>
+            <!-- ===== AC SECOND (RIGHT) ===== -->
+            <div class="status-item">
+                <div class="status-icon">❄️</div>
+                <div class="label">Air Conditioning</div>
+                <div class="status-indicator {ac_class}" id="s-ac">{ac_status}</div>
+                <div class="targets" id="g-ac">Target: {ac_target}°F ± {ac_swing}°F</div>
+            </div>
+        </div>
+        
+                <form method="POST" action="/update" class="controls">
+            <h2 style="text-align: center; color: #34495e; margin-bottom: 20px;">🎯 Adjust Hold Settings</h2>
+            <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 20px;">
+                <!-- ===== LEFT COLUMN: Heater ===== -->
+                <div>
+                    <div class="control-group">
+                        <label class="control-label">🔥 Heater Target (°F)</label>
+                        <input type="number" name="heater_target" value="{heater_target}" step="0.5" min="60" max="85">
+                    </div>
+                </div>
+                
+                <!-- ===== RIGHT COLUMN: AC ===== -->
+                <div>
+                    <div class="control-group">
+                        <label class="control-label">❄️ AC Target (°F)</label>
+                        <input type="number" name="ac_target" value="{ac_target}" step="0.5" min="60" max="85">
+                    </div>
+                </div>
+            </div>
+            
+            <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin-top: 20px;">
+                <button type="submit" name="hold_type" value="temp" class="btn" style="background: linear-gradient(135deg, #f39c12, #e67e22);">
+                    ⏸️ Temp Hold
+                </button>
+                <button type="submit" name="hold_type" value="perm" class="btn" style="background: linear-gradient(135deg, #e74c3c, #c0392b);">
+                    🛑 Perm Hold
+                </button>
+            </div>
+        </form>
+    </div>
+    
+    <div class="card full-width">
+        <h2 style="text-align: center; color: #34495e; margin-bottom: 20px;">📅 Daily Schedule</h2>
+        <div style="text-align: center; margin-bottom: 15px;">
+            <strong>Status:</strong> 
+            {schedule_badge}
+        </div>
+        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-bottom: 20px;">
+            {schedule_cards}
+        </div>
+        {mode_buttons}
+        
+        <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin-top: 20px;">
+            <a href="/schedule" class="btn" style="text-decoration: none; display: inline-block;">
+                📅 Edit Schedules
+            </a>
+            <a href="/settings" class="btn" style="text-decoration: none; display: inline-block; background: linear-gradient(135deg, #95a5a6, #7f8c8d);">
+                ⚙️ Advanced Settings
+            </a>
+        </div>
+    </div>
+    
+    <div class="footer" id="st" data-v="{state_v}">
+        ⏰ Last updated: <span id="ts">{time}</span><br>
+        🔄 Auto-refresh every 30 seconds
+    </div>
+""" + '<script defer src="/dash.js?v={}"></script>'.format(_STATIC_FILES[b'/dash.js'][2]) + """
+<script>
+document.addEventListener('DOMContentLoaded', function() {{
+    var heaterInput = document.querySelector('input[name="heater_target"]');
+    var acInput = document.querySelector('input[name="ac_target"]');
+    if (heaterInput && acInput) {{
+        heaterInput.addEventListener('input', function() {{
+            var heaterVal = parseFloat(heaterInput.value);
+            var acVal = parseFloat(acInput.value);
+            if (!isNaN(heaterVal) && heaterVal > acVal) {{
+                acInput.value = heaterVal;
+            }}
+        }});
+        acInput.addEventListener('input', function() {{
+            var heaterVal = parseFloat(heaterInput.value);
+            var acVal = parseFloat(acInput.value);
+            if (!isNaN(acVal) && acVal < heaterVal) {{
+                heaterInput.value = acVal;
+            }}
+        }});
+    }}
+}});
+</script>""" + _PAGE_FOOT
+
+_PERMANENT_HOLD_BANNER = """
+                <div style="background: linear-gradient(135deg, #e74c3c, #c0392b); color: white; padding: 15px; border-radius: 10px; text-align: center; font-weight: bold; margin-bottom: 20px; box-shadow: 0 4px 8px rgba(0,0,0,0.2); animation: fadeIn 0.5s;">
+                    🛑 PERMANENT HOLD - Schedules disabled (Manual control only)
+                </div>
+                """.encode('utf-8')
+
+_TEMP_HOLD_BANNER_FMT = """
+                <div style="background: linear-gradient(135deg, #f39c12, #e67e22); color: white; padding: 15px; border-radius: 10px; text-align: center; font-weight: bold; margin-bottom: 20px; box-shadow: 0 4px 8px rgba(0,0,0,0.2); animation: fadeIn 0.5s;">
+                    ⏸️ TEMPORARY HOLD - Manual override active%s
+                </div>
+                """
+
+# One status card on the error page: %s label, %s value
+_CARD_FMT = ('<div class="status-card">'
+             '<div style="font-size: 14px; color: #7f8c8d; margin-bottom: 5px;">%s</div>'
+             '<div style="font-size: 24px; font-weight: bold; color: #2c3e50;">%s</div>'
+             '</div>')
+
+def _split_template(tmpl):
+    """Split a str.format template into a tuple alternating encoded literal chunks and field names."""
+    parts = []
+    start = i = 0
+    while True:
+        j = tmpl.find('{', i)
+        if j < 0:
+            break
+        if tmpl[j + 1:j + 2] == '{':  # Escaped brace, part of the literal
+            i = j + 2
+            continue
+        k = tmpl.find('}', j)
+        parts.append(tmpl[start:j].replace('{{', '{').replace('}}', '}').encode('utf-8'))
+        parts.append(tmpl[j + 1:k])
+        start = i = k + 1
+    parts.append(tmpl[start:].replace('{{', '{').replace('}}', '}').encode('utf-8'))
+    return tuple(parts)
+
+def _blob_parts(parts):
+    """Re-point the literal chunks of a streamed template at memoryview slices of one contiguous blob.
+
+    Only for templates sent through _send_parts(); bytes.join() on MicroPython rejects memoryviews.
+    """
+    mv = memoryview(b''.join([parts[i] for i in range(0, len(parts), 2)]))
+    out = list(parts)
+    o = 0
+    for i in range(0, len(parts), 2):
+        n = len(parts[i])
+        out[i] = mv[o:o + n]
+        o += n
+    return tuple(out)
+
+_STATUS_PARTS = _blob_parts(_split_template(_STATUS_TEMPLATE))
+del _STATUS_TEMPLATE  # Only the encoded chunks are kept in RAM
+_STATUS_TIME_SLOT = _STATUS_PARTS[1::2].index('time')  # The one field that changes every minute
+
+# Error page (fields: title, message, cards)
+_ERROR_PARTS = _blob_parts(_split_template(_page_head('Error - Climate Control', b'/error.css') + """
+    <div class="container">
+        <div class="error-banner">
+            <div class="error-title">❌ {title}</div>
+            <div class="error-message">{message}</div>
+        </div>
+        
+        <div class="status-grid">
+            {cards}
+        </div>
+        
+        <div style="text-align: center;">
+            <a href="/" class="btn">⬅️ Go Back</a>
+        </div>
+    </div>""" + _PAGE_FOOT))
+
+# Schedule editor page (fields: inside_temp, outside_temp, schedule_inputs)
+_SCHED_EDITOR_PARTS = _blob_parts(_split_template(_page_head('Schedule Editor - Climate Control', b'/schedule.css') + """
+        <div class="container">
+            <h1>📅 Schedule Configuration</h1>
+            
+            <div class="header-info">
+                <div>🏠 Inside: <strong>{inside_temp}°F</strong></div>
+                <div>🌡️ Outside: <strong>{outside_temp}°F</strong></div>
+            </div>
+            
+            <form method="POST" action="/schedule">
+                <h3 style="color: #34495e; margin-bottom: 15px;">⏰ Configure Schedule Times & Temperatures</h3>
+                <p style="color: #7f8c8d; margin-bottom: 20px;">
+                    Set up to 4 time-based schedules. Leave time blank to disable a schedule.
+                </p>
+                
+                {schedule_inputs}
+                
+                <div style="margin-top: 20px;">
+                    <button type="submit" name="mode_action" value="save_schedules" class="btn" style="width: 100%;">
+                        💾 Save Schedule Configuration
+                    </button>
+                </div>
+            </form>
+            
+            <div style="text-align: center; margin-top: 20px;">
+                <a href="/" class="btn" style="background: linear-gradient(135deg, #95a5a6, #7f8c8d);">
+                    ⬅️ Back to Dashboard
+                </a>
+            </div>
+            
+            <div style="text-align: center; color: #7f8c8d; margin-top: 20px; padding-top: 20px; border-top: 2px solid #ecf0f1;">
+                💡 This page does not auto-refresh<br>
+                To change modes (Automatic/Hold), return to the dashboard
+            </div>
+        </div>
+<script defer src="/sched.js"></script>""" + _PAGE_FOOT))
+
+# Advanced settings page (fields: inside_temp, outside_temp, heater_swing, ac_swing, temp_hold_mins, timezone_offset)
+_SETTINGS_PARTS = _blob_parts(_split_template(_page_head('Advanced Settings - Climate Control', b'/settings.css') + """
+    <div class="container">
+        <h1>⚙️ Advanced Settings</h1>
+        
+        <div class="header-info">
+            <div>🏠 Inside: <strong>{inside_temp}°F</strong></div>
+            <div>🌡️ Outside: <strong>{outside_temp}°F</strong></div>
+        </div>
+        
+        <div class="info-box">
+            💡 <strong>Note:</strong> These settings control the tolerance ranges for automatic climate control. Changes take effect immediately.
+        </div>
+        
+        <form method="POST" action="/settings">
+            <div class="setting-group">
+                <h3>🔥 Heating System</h3>
+                <label>Heater Swing (±°F)</label>
+                <input type="number" name="heater_swing" value="{heater_swing}" step="0.5" min="0.5" max="5" required>
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    How many degrees below target before heater turns ON
+                </small>
+            </div>
+            
+            <div class="setting-group">
+                <h3>❄️ Air Conditioning</h3>
+                <label>AC Swing (±°F)</label>
+                <input type="number" name="ac_swing" value="{ac_swing}" step="0.5" min="0.5" max="5" required>
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    How many degrees above target before AC turns ON
+                </small>
+            </div>
+            
+            <div class="setting-group">
+                <h3>⏱️ Hold Duration</h3>
+                <label>Temporary Hold Duration (minutes)</label>
+                <input type="number" name="temp_hold_duration" value="{temp_hold_mins}" step="1" min="1" max="1440" required>
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    How long temporary holds last before auto-resuming (default: 60 min)
+                </small>
+            </div>
+            
+            <div class="setting-group">
+                <h3>🌐 Timezone</h3>
+                <label>UTC Offset (hours)</label>
+                <input type="number" name="timezone_offset" value="{timezone_offset}" step="1" min="-12" max="14" required>
+                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
+                    CST=-6, CDT=-5, EST=-5, EDT=-4, MST=-7, PST=-8
+                </small>
+            </div>
+            
+            <button type="submit" class="btn">💾 Save Settings</button>
+        </form>
+        
+        <a href="/" class="btn btn-secondary" style="text-align: center;">⬅️ Back to Dashboard</a>
+    </div>""" + _PAGE_FOOT))
+
+def _slot_values(parts, values):
+    """Encode the fields in dict `values` into a list ordered like the slots of `parts` (bytes pass through)."""
+    out = []
+    for i in range(1, len(parts), 2):
+        v = values[parts[i]]
+        out.append(v if isinstance(v, bytes) else v.encode('utf-8'))
+    return out
+
+def _render(parts, values):
+    """Join a _split_template() tuple with field values from dict `values` into one bytes object."""
+    out = []
+    a = out.append
+    encoded = _slot_values(parts, values)
+    for i in range(len(encoded)):
+        a(parts[2 * i])
+        a(encoded[i])
+    a(parts[-1])
+    return b''.join(out)
+
+# Dashboard schedule card, split into encoded chunks around: time, name, heater_temp, ac_temp
+# (kept on one line and styled from /style.css: it is repeated per schedule)
+_SCHED_CARD = _split_template(
+    '<div class="sched-card"><div class="sched-card-title">🕐 {time} - {name}</div>'
+    '<div class="sched-card-temps">Heat: {heater_temp}°F | AC: {ac_temp}°F</div></div>\n')
+
+_NO_SCHEDULES_CARD = b"""
+                <div style="text-align: center; color: #95a5a6; grid-column: 1 / -1;">
+                    No schedules configured
+                </div>
+                """
+
+# Placeholder for unused schedule editor rows (shared, never mutated)
+_EMPTY_SCHEDULE = {'time': '', 'name': ''}
+
+# Schedule editor row; {n} (1-based number) and {i} (index) are filled in per row at import,
+# leaving _SCHED_ROWS[i] with the user fields: time, name, heater, ac
+_SCHED_ROW = """<div class="sched">
+<h3>Schedule {n}</h3>
+<input type="hidden" name="schedule_{i}_exists" value="1">
+<input type="hidden" name="schedule_{i}_last_changed" id="schedule_{i}_last_changed" value="">
+<label>Time</label>
+<input type="time" name="schedule_{i}_time" value="{time}">
+<label>Name</label>
+<input type="text" name="schedule_{i}_name" value="{name}" placeholder="Schedule {n}">
+<label>Heater (°F)</label>
+<input type="number" name="schedule_{i}_heater" value="{heater}" step="0.5" min="60" max="85" required oninput="schedSync({i}, 'heater')" onchange="schedSync({i}, 'heater')">
+<label>AC (°F)</label>
+<input type="number" name="schedule_{i}_ac" value="{ac}" step="0.5" min="60" max="90" required oninput="schedSync({i}, 'ac')" onchange="schedSync({i}, 'ac')">
+</div>
+"""
+_SCHED_ROWS = tuple(_split_template(_SCHED_ROW.replace('{n}', str(i + 1)).replace('{i}', str(i))) for i in range(4))
+del _SCHED_ROW
+
+# Bare page sent when the dashboard itself fails to render ({message} = the escaped exception)
+_FALLBACK_PARTS = _split_template("<html><body><h1>Error loading page</h1><pre>{message}</pre></body></html>")
+
+def _html_escape(s):
+    """Escape text for HTML element content or a double-quoted attribute (schedule names are user input)."""
+    if '&' in s:
+        s = s.replace('&', '&amp;')
+    if '<' in s:
+        s = s.replace('<', '&lt;')
+    if '>' in s:
+        s = s.replace('>', '&gt;')
+    if '"' in s:
+        s = s.replace('"', '&quot;')
+    return s
+
+# Dashboard banner after a successful /update
+_SUCCESS_HTML = """
+            <div class="success-message">
+                ✅ Settings updated successfully!
+            </div>
+            """.encode('utf-8')
+
+# Dashboard schedule modes, as returned by _sched_mode(); const() lets the compiler inline them
+_MODE_NONE = const(0)
+_MODE_AUTO = const(1)
+_MODE_PERM_HOLD = const(2)
+_MODE_TEMP_HOLD = const(3)
+
+# Status badge per mode: (label, color, icon), pre-rendered into _SCHED_BADGE
+_SCHED_MODES = (
+    ("NO SCHEDULES", "#95a5a6", "⚠️"),
+    ("AUTOMATIC", "#2ecc71", "✅"),
+    ("PERMANENT HOLD", "#e74c3c", "🛑"),
+    ("TEMPORARY HOLD", "#f39c12", "⏸️"),
+)
+_SCHED_BADGE = tuple(
+    '<span style="color: {1}; font-weight: bold;">\n                {0} {2}\n            </span>'.format(*m).encode('utf-8')
+    for m in _SCHED_MODES)
+del _SCHED_MODES  # Only the encoded badges are kept in RAM
+
+def _sched_mode(config):
+    """Return the dashboard schedule mode (_MODE_*) for config."""
+    if not any(s.get('time') for s in config.get('schedules', [])):
+        return _MODE_NONE
+    if config.get('schedule_enabled'):
+        return _MODE_AUTO
+    return _MODE_PERM_HOLD if config.get('permanent_hold', False) else _MODE_TEMP_HOLD
+
+# Dashboard mode blocks indexed by mode; automatic mode names the running schedule (_AUTO_MODE_PARTS)
+_NO_SCHED_HTML = """
+            <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; text-align: center; color: #7f8c8d; margin: 20px 0;">
+                ℹ️ No schedules configured - <a href="/schedule" style="color: #667eea; font-weight: bold;">Configure schedules</a>
+            </div>
+            """.encode('utf-8')
+_PERM_HOLD_HTML = """
+            <form method="POST" action="/schedule" style="margin: 20px 0;">
+                <div style="background: linear-gradient(135deg, #e74c3c, #c0392b); color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
+                    <div style="font-weight: bold; font-size: 18px; margin-bottom: 10px;">🛑 Permanent Hold</div>
+                    <div style="font-size: 14px; margin-bottom: 15px;">Manual control only - Schedules disabled</div>
+                    <div style="text-align: center;">
+                        <button type="submit" name="mode_action" value="resume" style="padding: 10px 20px; background: #2ecc71; color: white; border: none; border-radius: 6px; cursor: pointer; font-weight: bold;">▶️ Resume Scheduling</button>
+                    </div>
+                </div>
+            </form>
+            """.encode('utf-8')
+_TEMP_HOLD_HTML = """
+            <form method="POST" action="/schedule" style="margin: 20px 0;">
+                <div style="background: linear-gradient(135deg, #f39c12, #e67e22); color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
+                    <div style="font-weight: bold; font-size: 18px; margin-bottom: 10px;">⏸️ Temporary Hold</div>
+                    <div style="font-size: 14px; margin-bottom: 15px;">Manual override active</div>
+                    <div style="text-align: center;">
+                        <button type="submit" name="mode_action" value="resume" style="padding: 10px 20px; background: #2ecc71; color: white; border: none; border-radius: 6px; cursor: pointer; font-weight: bold;">▶️ Resume Scheduling</button>
+                    </div>
+                </div>
+            </form>
+            """.encode('utf-8')
+_MODE_HTML = (_NO_SCHED_HTML, None, _PERM_HOLD_HTML, _TEMP_HOLD_HTML)
+
+# Automatic mode block (field: name = currently running schedule)
+_AUTO_MODE_PARTS = _split_template("""
+            <form method="POST" action="/schedule" class="mode-form">
+                <div class="mode-auto">
+                    <div class="mode-title">✅ Automatic Mode</div>
+                    <div class="mode-sub">Currently running: <strong>{name}</strong></div>
+                    <div class="mode-note">Temperatures adjust based on schedule</div>
+                </div>
+            </form>
+            """)
+
+# Relay state labels, indexed by 0 (off) or 1 (on); _STATE holds encoded (label, CSS class) pairs for the dashboard
+_STATE_STR = ('OFF', 'ON')
+_STATE = ((b'OFF', b'off'), (b'ON', b'on'))
+
+_FMT_MEMO = {}  # Recent reading -> formatted str (readings rarely change between renders)
+
+def _fmt_temp(t):
+    """Format a temperature to one decimal using tenths-integer math; non-numbers (e.g. "N/A") pass through as str."""
+    s = _FMT_MEMO.get(t)
+    if s is None:
+        if isinstance(t, (int, float)) and t == t and abs(t) < 1e9:  # Finite (t == t rules out NaN)
+            i = int(t * 10 + (0.5 if t >= 0 else -0.5))
+            s = '%s%d.%d' % ('-' if i < 0 else '', abs(i) // 10, abs(i) % 10)
+        else:
+            s = str(t)  # Memoized too: a missing sensor would otherwise raise and catch on every render
+        if len(_FMT_MEMO) >= 8:
+            _FMT_MEMO.clear()
+        _FMT_MEMO[t] = s
+    return s
+
+def _relay_states(ac_monitor, heater_monitor):
+    """Return (heater_on, ac_on) as 0/1, reading each relay once (None monitor = off)."""
+    return (1 if (heater_monitor and heater_monitor.heater.get_state()) else 0,
+            1 if (ac_monitor and ac_monitor.ac.get_state()) else 0)
+
+def _sensor_fmt(sensors, key):
+    """Formatted cached reading of sensors[key] (never touches the bus); "N/A" if there is none yet."""
+    v = getattr(sensors.get(key), 'last_temp', None)
+    return "N/A" if v is None else _fmt_temp(v)
+
+# Numeric fields accepted by POST /update, in the order _handle_update parses them into
+_UPDATE_FIELDS = ('ac_target', 'ac_swing', 'heater_target', 'heater_swing')
+
+# Schedule form field names per slot: (time, name, ac, heater)
+_SCHED_KEYS = tuple(
+    ('schedule_{}_time'.format(i), 'schedule_{}_name'.format(i),
+     'schedule_{}_ac'.format(i), 'schedule_{}_heater'.format(i))
+    for i in range(4)
+)
+
+def _parse_content_length(data, header_end):
+    """Content-Length of raw request bytes (0 if absent), or -1 if malformed or repeated.
+
+    Only plain decimal digits are accepted (no sign, leading zero, '_' or inner whitespace), so
+    the value cannot be read differently here than by a proxy in front of us.
+    """
+    if header_end < 0:
+        return -1
+    head = data[:header_end].lower()  # One copy of the header block, no per-line strings
+    i = head.find(b'\r\ncontent-length:')
+    if i < 0:
+        return 0
+    if head.find(b'\r\ncontent-length:', i + 17) >= 0:
+        return -1
+    i += 17
+    j = head.find(b'\r\n', i)
+    value = head[i:] if j < 0 else head[i:j]
+    value = value.strip(b' \t')  # Optional whitespace around the field value
+    if not value or not value.isdigit() or (value[0] == 48 and len(value) > 1):
+        return -1
+    return int(value)
+
+def _form_pairs(body, i=0):
+    """Yield (key str, raw value bytes) from a urlencoded form body starting at offset i, scanning it once with find()."""
+    end = len(body)
+    while i < end:
+        amp = body.find(b'&', i)
+        if amp < 0:
+            amp = end
+        eq = body.find(b'=', i, amp)
+        if eq >= 0:
+            try:
+                yield body[i:eq].decode('utf-8'), body[eq+1:amp]
+            except UnicodeError:
+                pass  # Not one of our field names: skip the pair, keep the rest of the form
+        i = amp + 1
+
+_FLOAT_CHARS = b'0123456789.-'  # Plain decimals only: no '_', spaces ('+'), hex, exponents, inf/nan
+
+def _form_float(value):
+    """Parse a raw form value as a plain decimal float; None if it is empty or anything else."""
+    for c in value:
+        if c not in _FLOAT_CHARS:
+            return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+# Schedule targets accepted by POST /schedule: the editor inputs' min/max (°F)
+_SCHED_HEATER_RANGE = (60, 85)
+_SCHED_AC_RANGE = (60, 90)
+
+def _form_int(value):
+    """Parse a raw form value as a decimal number truncated to int (60.5 -> 60); None if invalid."""
+    v = _form_float(value)
+    return None if v is None else int(v)
+
+# POST /settings fields -> parser for the raw value; other keys are ignored unparsed
+_SETTINGS_COERCE = {
+    'ac_swing': _form_float,
+    'heater_swing': _form_float,
+    'temp_hold_duration': _form_int,  # Minutes
+    'timezone_offset': _form_int,
+}
+
+def _url_decode_into(buf, src):
+    """Decode urlencoded bytes src ('+' -> space, %XX -> byte) into bytearray buf; return bytes written."""
+    end = len(src)
+    n = i = 0
+    while i < end:
+        c = src[i]
+        if c == 43:  # '+'
+            c = 32
+        elif c == 37 and i + 2 < end:  # '%XX'
+            try:
+                c = int(src[i + 1:i + 3], 16)
+                i += 2
+            except ValueError:
+                pass
+        buf[n] = c
+        n += 1
+        i += 1
+    return n
+
+# config['schedule_format'] once schedule time/name are stored decoded (files from older firmware lack the key)
+_SCHEDULE_FORMAT = const(2)
+
+def _decode_schedules(config):
+    """Decode schedule time/name left URL-encoded by older firmware, once: the dict is then marked migrated."""
+    if config.get('schedule_format', 1) >= _SCHEDULE_FORMAT:
+        return  # Already decoded: a '+' here is part of the name
+    for schedule in config.get('schedules') or ():
+        t = schedule.get('time')
+        if t and '%3A' in t:
+            schedule['time'] = t.replace('%3A', ':')
+        name = schedule.get('name')
+        if name and '+' in name:
+            schedule['name'] = name.replace('+', ' ')
+    config['schedule_format'] = _SCHEDULE_FORMAT
+
+def _config_stamp():
+    """(mtime, size) of config.json: changes whenever another writer replaces it."""
+    st = os.stat('config.json')
+    return (st[8], st[6])
+
 class TempWebServer:
     """Simple web server for viewing temperatures and adjusting settings."""
+    DEBUG_TRACEBACKS = False  # Full tracebacks on errors (allocates; the one-line message is always printed)
+
     def __init__(self, port=80):
         self.port = port
         self.socket = None
         self.sensors = {}
         self.last_page_render = 0  # Track last successful HTML generation
+        self._config_rev = 0  # Bumped on every config save (part of dashboard ETag)
+        self._tags = {}  # Slot ('etag' / 'version') -> (last key, its tag); see _tag()
+        self._tag_seq = 0
+        try:
+            boot = int.from_bytes(os.urandom(4), 'big')
+        except Exception:
+            boot = time.ticks_ms()
+        # Per-boot prefix so a tag from before a reboot never matches a new state
+        self._boot_tag = '{:x}-'.format(boot)
+        # Pooled response buffer (allocated once, reused by every HTML response)
+        self._resp_buf = bytearray(4096)
+        self._resp_mv = memoryview(self._resp_buf)
+        self._resp_off = 0
+        self._sched_form_cache = None  # (schedules list, (config rev, defaults), html) of last rendered schedule form
+        self._row_cache = {}  # (i, time, name, heater, ac) -> encoded schedule editor row
+        self._cfg_cache = (None, None)  # (config.json stamp, parsed dict) - avoids flash read + parse per request
+        self._cfg_checked = 0  # ticks_ms of the last config.json stat (at most one per second)
+        self._page_cache = (None, None, None)  # (encoded dashboard field values, clock str in them, key)
+        self._settings_cache = (None, None)  # (config values key, encoded settings page fields)
+        self._cards_cache = (None, -1, None)  # (schedules list, config rev, joined dashboard schedule cards)
+        self._minutes_cache = (None, -1, ())  # (schedules list, config rev, ((start minute, schedule), ...))
+        self._saved_config = (None, None)  # (config.json stamp, JSON text) of our last write
+        self._decode_buf = bytearray(64)  # Reused by _url_decode for form values
+        self._time_cache = (-1, '')  # (epoch minute, formatted dashboard clock)
+        self._temps_cache = (0, None)  # (ticks_ms, (inside, outside)) of the last sensor bus read, reused for 1 s
+        self._send_discord = discord_webhook.send_discord_message  # Bound once, not looked up per POST
+        self._discord_queue = []  # Messages sent from check_requests once no client is waiting
+        self._accept_poller = select.poll()  # Watches the listening socket (registered in start())
+        self._poller = select.poll()  # Watches the connection whose request is still arriving
+        self._pending = None  # [conn, bytes received so far, accept ticks_ms] until the request is complete
+        # Pooled receive buffer (allocated once; requests are read into it in place)
+        self._recv_buf = bytearray(4096)
+        self._recv_mv = memoryview(self._recv_buf)
+        self._nodelay = _TCP_NODELAY is not None  # Cleared if setsockopt(TCP_NODELAY) is refused
 
     def start(self):
         """Start the web server (non-blocking)."""
@@ -17,8 +1140,9 @@ class TempWebServer:
             self.socket = socket.socket()
             self.socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
             self.socket.bind(('0.0.0.0', self.port))
-            self.socket.listen(1)
+            self.socket.listen(2)  # Page + /style.css can queue while the loop is busy
             self.socket.setblocking(False)
+            self._accept_poller.register(self.socket, select.POLLIN)
             print("Web server started on port {}".format(self.port))
         except Exception as e:
             print("Failed to start web server: {}".format(e))
@@ -27,184 +1151,416 @@ class TempWebServer:
         """Check for incoming requests (call in main loop)."""
         if not self.socket:
             return
+        if self._pending is None:
+            if not self._accept_poller.poll(0):
+                # Idle: deliver one queued Discord message now that no client is waiting on us
+                if self._discord_queue:
+                    self._send_discord(self._discord_queue.pop(0))
+                return
+            try:
+                conn, addr = self.socket.accept()
+            except OSError:
+                return  # Client gave up between poll and accept
+            if self._nodelay:
+                try:
+                    conn.setsockopt(_IPPROTO_TCP, _TCP_NODELAY, 1)
+                except OSError:
+                    self._nodelay = False  # Not supported by this stack: stop trying
+            conn.setblocking(False)
+            self._poller.register(conn, select.POLLIN)
+            self._pending = [conn, 0, time.ticks_ms()]
+        
+        conn, off, started = self._pending
+        done = True
         try:
-            conn, addr = self.socket.accept()
-            conn.settimeout(3.0)
-            
-            # Read request headers first (in chunks to avoid truncation)
-            request_bytes = b''
-            while b'\r\n\r\n' not in request_bytes:
-                chunk = conn.recv(512)
-                if not chunk:
-                    break
-                request_bytes += chunk
-                if len(request_bytes) > 4096:  # Safety limit
+            # Take whatever has arrived without blocking, straight into the pooled receive buffer
+            closed = False
+            size = len(self._recv_buf)
+            while off < size and self._poller.poll(0):
+                n = conn.readinto(self._recv_mv[off:])  # Everything available, up to the free space
+                if n is None:
+                    break  # EAGAIN after all
+                if not n:
+                    closed = True
                     break
+                off += n
+            if off >= 10 and self._recv_buf[:10] == _PING_PREFIX:
+                # Health check: answer from the request line alone, before headers or any copy
+                conn.settimeout(3.0)
+                self._send_raw(conn, _PING_RESPONSE)
+                return
+            request_bytes = bytes(self._recv_mv[:off])  # One copy per pass, not one per chunk
             
-            # Parse Content-Length from headers
-            request = request_bytes.decode('utf-8')
-            content_length = 0
-            if 'Content-Length:' in request:
-                for line in request.split('\r\n'):
-                    if line.lower().startswith('content-length:'):
-                        content_length = int(line.split(':')[1].strip())
-                        break
-            
-            # If POST request with body, read remaining data
-            if 'POST' in request and content_length > 0:
-                # Check how much body we already have
-                header_end = request.find('\r\n\r\n') + 4
-                body_so_far = request[header_end:]
-                bytes_read = len(body_so_far.encode('utf-8'))
-                bytes_needed = content_length - bytes_read
-                
-                # Read remaining body in loop (recv() may not return all at once!)
-                if bytes_needed > 0:
-                    remaining_parts = []
-                    total_read = 0
-                    
-                    # Keep reading until we have all bytes
-                    while total_read < bytes_needed:
-                        chunk = conn.recv(min(512, bytes_needed - total_read))
-                        if not chunk:
-                            print("WARNING: Connection closed before all data received!")
-                            break
-                        remaining_parts.append(chunk)
-                        total_read += len(chunk)
-                    
-                    remaining = b''.join(remaining_parts)
-                    request = request[:header_end] + body_so_far + remaining.decode('utf-8')
-
-            if 'POST /update' in request:
-                response = self._handle_update(request, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
-                # If error page redirects, handle it
-                if isinstance(response, str) and response.startswith('HTTP/1.1'):
-                    print("DEBUG: Sending redirect from /update ({} bytes)".format(len(response)))
-                    conn.sendall(response.encode('utf-8'))
-                    conn.close()
-                    print("DEBUG: Redirect sent, connection closed")
+            header_end = request_bytes.find(b'\r\n\r\n')
+            if header_end < 0:
+                if off == size:
+                    conn.settimeout(3.0)  # Early answers are sent blocking (bounded) too
+                    self._send_raw(conn, _PAYLOAD_TOO_LARGE)  # Headers alone overflow the buffer
                     return
-
-            elif 'GET /schedule' in request:
-                response = self._get_schedule_editor_page(sensors, ac_monitor, heater_monitor)
-                response_bytes = response.encode('utf-8')
-                
-                # Send headers
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: text/html; charset=utf-8\r\n')
-                conn.sendall('Content-Length: {}\r\n'.format(len(response_bytes)).encode('utf-8'))
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                
-                # Send body in chunks (MicroPython has small socket buffer)
-                chunk_size = 1024  # Send 1KB at a time
-                for i in range(0, len(response_bytes), chunk_size):
-                    chunk = response_bytes[i:i+chunk_size]
-                    conn.sendall(chunk)
-                
-                conn.close()
-                print("DEBUG: Schedule editor page sent successfully ({} bytes total)".format(len(response_bytes)))
+            elif request_bytes.startswith(b'POST'):
+                need = header_end + 4 + _parse_content_length(request_bytes, header_end)
+                if need > _RECV_MAX:
+                    conn.settimeout(3.0)
+                    self._send_raw(conn, _PAYLOAD_TOO_LARGE)  # Refuse before reading the body
+                    return
+                if need > size:
+                    # Declared body fits the cap but not the buffer: grow it (once, for good)
+                    buf = bytearray(need)
+                    buf[:off] = self._recv_mv[:off]  # Only what arrived: copying all of the old buffer would resize buf
+                    self._recv_buf, self._recv_mv = buf, memoryview(buf)
+                    size = need
+            if not closed and off < size and not self._request_complete(request_bytes):
+                if time.ticks_diff(time.ticks_ms(), started) < 3000:
+                    # Not all here yet - let the main loop run and look again next pass
+                    self._pending[1] = off
+                    done = False
+                return  # Else the client stalled; drop it
+            if not request_bytes:
                 return
-
-            elif 'GET /settings' in request:
-                response = self._get_settings_page(sensors, ac_monitor, heater_monitor)
-                response_bytes = response.encode('utf-8')
-                
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: text/html; charset=utf-8\r\n')
-                conn.sendall('Content-Length: {}\r\n'.format(len(response_bytes)).encode('utf-8'))
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                
-                chunk_size = 1024
-                for i in range(0, len(response_bytes), chunk_size):
-                    chunk = response_bytes[i:i+chunk_size]
-                    conn.sendall(chunk)
-                
-                conn.close()
-                print("DEBUG: Settings page sent successfully ({} bytes total)".format(len(response_bytes)))
+            if request_bytes.startswith(b'POST'):
+                if _parse_content_length(request_bytes, request_bytes.find(b'\r\n\r\n')) < 0:
+                    conn.settimeout(3.0)
+                    self._send_raw(conn, _BAD_REQUEST)
+                    return
+                if closed:
+                    print("WARNING: Connection closed before all data received!")
+            
+            conn.settimeout(3.0)  # Blocking again (bounded) while the response is sent
+            
+            # Route on the request line only: METHOD SP PATH SP VERSION
+            eol = request_bytes.find(b'\r\n')
+            if eol < 0:
+                eol = len(request_bytes)
+            sp1 = request_bytes.find(b' ', 0, eol)
+            sp2 = request_bytes.find(b' ', sp1 + 1, eol)
+            if sp1 <= 0 or sp2 <= sp1 + 1:
+                self._send_raw(conn, _BAD_REQUEST)  # No parseable request line: never guess a route
                 return
+            method = request_bytes[:sp1]
+            path = request_bytes[sp1 + 1:sp2]
+            q = path.find(b'?')
+            if q >= 0:
+                path = path[:q]
+            
+            if method == b'HEAD':
+                self._route_head(conn, request_bytes, path)  # Headers only: nothing is rendered or read
+                return
+            route = self._ROUTES.get((method, path), '_route_dashboard')
             
-            elif 'POST /settings' in request:
-                response = self._handle_settings_update(request, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
-                if isinstance(response, str) and response.startswith('HTTP/1.1'):
-                    conn.sendall(response.encode('utf-8'))
-                    conn.close()
-                    print("DEBUG: Settings update redirect sent")
-                    return
+            if method == b'POST':
+                # Form handlers only need the fields: drop the raw request (headers and all)
+                # before their slow save/notify work instead of holding it to the end
+                header_end = request_bytes.find(b'\r\n\r\n')
+                req = list(_form_pairs(request_bytes, header_end + 4 if header_end >= 0 else len(request_bytes)))
+            else:
+                req = request_bytes
+            request_bytes = None
 
-            elif 'POST /schedule' in request:
-                response = self._handle_schedule_update(request, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
-                # Redirects are already complete HTTP responses, send directly
-                if isinstance(response, str) and response.startswith('HTTP/1.1'):
-                    print("DEBUG: Sending redirect ({} bytes)".format(len(response)))
-                    conn.sendall(response.encode('utf-8'))
-                    conn.close()
-                    print("DEBUG: Redirect sent, connection closed")
-                    return
+            getattr(self, route)(conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
 
-            elif 'GET /sched.js' in request:
-                js = self._build_sched_js()  # bytes
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: application/javascript; charset=utf-8\r\n')
-                conn.sendall('Content-Length: {}\r\n'.format(len(js)).encode('utf-8'))
-                conn.sendall(b'Cache-Control: max-age=300\r\n')
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                conn.sendall(js)
+        except OSError:
+            pass
+        except Exception as e:
+            print("Web server error: {}".format(e))
+            if self.DEBUG_TRACEBACKS:
+                sys.print_exception(e)
+        finally:
+            if done:
+                self._poller.unregister(conn)
+                self._pending = None
                 conn.close()
-                return
 
-            elif 'GET /ping' in request:
-                # Quick health check endpoint (no processing)
-                body = b'OK'
-                conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                conn.sendall(b'Content-Type: text/plain\r\n')
-                conn.sendall(b'Content-Length: 2\r\n')
-                conn.sendall(b'Connection: close\r\n')
-                conn.sendall(b'\r\n')
-                conn.sendall(body)
-                conn.close()
-                return
+    def _request_complete(self, data):
+        """True once headers (and for POST, Content-Length bytes of body) have arrived."""
+        header_end = data.find(b'\r\n\r\n')
+        if header_end < 0:
+            return False  # check_requests answers 413 once the buffer fills
+        if not data.startswith(b'POST'):
+            return True
+        content_length = _parse_content_length(data, header_end)
+        if content_length < 0:
+            return True  # Malformed - route now so it gets rejected
+        return len(data) - header_end - 4 >= content_length
 
-            else:
-                response = self._get_status_page(sensors, ac_monitor, heater_monitor, schedule_monitor)
+    # (method, path) -> handler; unmatched requests get the dashboard
+    _ROUTES = {
+        (b'POST', b'/update'): '_route_update',
+        (b'GET', b'/schedule'): '_route_schedule_page',
+        (b'GET', b'/settings'): '_route_settings_page',
+        (b'POST', b'/settings'): '_route_settings_update',
+        (b'POST', b'/schedule'): '_route_schedule_update',
+        (b'GET', b'/sched.js'): '_route_sched_js',
+        (b'GET', b'/style.css'): '_route_static',
+        (b'GET', b'/error.css'): '_route_static',
+        (b'GET', b'/schedule.css'): '_route_static',
+        (b'GET', b'/settings.css'): '_route_static',
+        (b'GET', b'/ping'): '_route_ping',
+        (b'GET', b'/state.json'): '_route_state',
+        (b'GET', b'/dash.js'): '_route_static',
+        (b'GET', b'/favicon.ico'): '_route_favicon',
+    }
+
+    def _route_update(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        response = self._handle_update(req, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
+        if response is None:
+            self._get_status_page(conn, sensors, ac_monitor, heater_monitor, schedule_monitor, show_success=True)
+        else:
+            self._send_response(conn, response)
+
+    def _route_settings_update(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        response = self._handle_settings_update(req, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
+        self._send_response(conn, response)
+
+    def _route_schedule_update(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        response = self._handle_schedule_update(req, sensors, ac_monitor, heater_monitor, schedule_monitor, config)
+        self._send_response(conn, response)
+
+    def _route_schedule_page(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        self._get_schedule_editor_page(conn, sensors, ac_monitor, heater_monitor)
+
+    def _route_settings_page(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        if self._get_settings_page(conn, sensors, ac_monitor, heater_monitor):
+            if _DEBUG:
+                print("DEBUG: Settings page sent successfully")
+
+    def _route_sched_js(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        js = self._build_sched_js()  # bytes
+        self._send_body(conn, _HDR_JS % len(js), js)
+
+    def _route_static(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        path = req[4:req.find(b' ', 4)]
+        q = path.find(b'?')
+        if q >= 0:
+            path = path[:q]
+        header, body, tag, gz_header, gz_body = _STATIC_FILES[path]
+        if gz_body is not None and 'gzip' in (self._get_header(req, 'accept-encoding:') or ''):
+            header, body, tag = gz_header, gz_body, tag + '-gz'
+        etag = '"{}"'.format(tag)
+        if self._get_header(req, 'if-none-match:') == etag:
+            self._send_raw(conn, (_NOT_MODIFIED % etag).encode('utf-8'))
+        else:
+            self._send_body(conn, header, body)
+
+    def _route_state(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        # Live dashboard values for /dash.js (~150 bytes instead of the whole page)
+        config = self._load_config()
+        inside_temp, outside_temp = self._current_temps(sensors)
+        ac_target, ac_swing, heater_target, heater_swing = self._status_strings(ac_monitor, heater_monitor)
+        heater_on, ac_on = _relay_states(ac_monitor, heater_monitor)
+        body = _STATE_JSON % (
+            _fmt_temp(inside_temp), _fmt_temp(outside_temp), heater_on, ac_on,
+            heater_target, heater_swing, ac_target, ac_swing,
+            self._time_str(), self._state_version(config, _sched_mode(config)))
+        body = body.encode('utf-8')
+        self._send_body(conn, _HDR_STATE % len(body), body)
+
+    def _route_head(self, conn, req, path):
+        # Same path table as GET, but only the headers: no template, sensor or relay work
+        static = _STATIC_FILES.get(path)
+        if static is None:
+            header = _HEAD_HEADERS.get(path, _HDR_HEAD_HTML)  # Unmatched paths get the dashboard, as for GET
+        elif static[4] is not None and 'gzip' in (self._get_header(req, 'accept-encoding:') or ''):
+            header = static[3]
+        else:
+            header = static[0]
+        self._send_raw(conn, header)
+
+    def _route_ping(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        # Quick health check endpoint (no processing)
+        self._send_raw(conn, _PING_RESPONSE)
+
+    def _route_favicon(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        # No icon - answer browser probes without building a page
+        self._send_raw(conn, _NO_CONTENT)
+
+    def _route_dashboard(self, conn, req, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        # Dashboard: answer 304 if the browser already has this state
+        try:
+            temps = self._current_temps(sensors)
+            states = _relay_states(ac_monitor, heater_monitor)  # Shared by the ETag and the page
+            etag = self._status_etag(temps, states, ac_monitor, heater_monitor, config)
+        except Exception as e:
+            self._send_fallback(conn, e)  # Same bare error page as a failed render
+            return
+        if self._get_header(req, 'if-none-match:') == etag:
+            self._send_raw(conn, (_NOT_MODIFIED % etag).encode('utf-8'))
+            return
+        self._get_status_page(conn, sensors, ac_monitor, heater_monitor, schedule_monitor, temps=temps, states=states,
+                              extra_headers='ETag: {}\r\nCache-Control: max-age=5\r\n'.format(etag))
+
+    def _send_response(self, conn, response):
+        """Send a handler result: a pre-built response (redirect) as-is, (parts, values) streamed, or an HTML page."""
+        if isinstance(response, tuple):
+            self._send_parts(conn, response[0], response[1])
+        elif response.startswith(b'HTTP/1.1'):
+            self._send_raw(conn, response)
+        else:
+            self._send_html(conn, response)
+
+    def _send_raw(self, conn, data):
+        """Send a complete response (headers included) in one sendall, then close."""
+        try:
+            conn.sendall(data)
+        except Exception as e:
+            print("ERROR: Failed to send response: {}".format(e))
+        finally:
+            conn.close()
+
+    def _send_body(self, conn, header, body):
+        """Send encoded header and body through the pooled buffer (no header + body copy), then close."""
+        try:
+            self._resp_off = 0
+            self._write(conn, header)
+            self._write(conn, body)
+            self._flush(conn)
+        except Exception as e:
+            print("ERROR: Failed to send response: {}".format(e))
+        finally:
+            conn.close()
+
+    def _send_html(self, conn, body):
+        """Send one pre-encoded HTML body with headers added, then close."""
+        return self._send_parts(conn, (body,), ())
+
+    def _write(self, conn, data):
+        """Copy bytes into the pooled response buffer, sending to conn each time it fills."""
+        src = memoryview(data)
+        size = len(self._resp_buf)
+        pos = 0
+        while pos < len(src):
+            take = min(size - self._resp_off, len(src) - pos)
+            self._resp_mv[self._resp_off:self._resp_off + take] = src[pos:pos + take]
+            self._resp_off += take
+            pos += take
+            if self._resp_off == size:
+                conn.sendall(self._resp_mv)
+                self._resp_off = 0
+
+    def _flush(self, conn):
+        """Send whatever is left in the pooled response buffer."""
+        if self._resp_off:
+            conn.sendall(self._resp_mv[:self._resp_off])
+            self._resp_off = 0
+
+    def _url_decode(self, value):
+        """URL-decode one raw form value to str; plain values are just decoded."""
+        if b'%' not in value and b'+' not in value:
+            return value.decode('utf-8')
+        if len(value) > len(self._decode_buf):
+            self._decode_buf = bytearray(len(value))
+        n = _url_decode_into(self._decode_buf, value)
+        return str(self._decode_buf[:n], 'utf-8')
+
+    def _get_header(self, request, name):
+        """Return the value of header `name` (lowercase, with colon) from raw request bytes, or None."""
+        n = len(name)
+        for line in request.split(b'\r\n')[1:]:
+            if not line:
+                break  # End of headers
+            if line[:n].decode('utf-8').lower() == name:
+                return line[n:].strip().decode('utf-8')
+        return None
+
+    def _current_temps(self, sensors):
+        """Return (inside_temp, outside_temp), reading sensors only if nothing is cached."""
+        inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
+        outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
+        if inside_temp is not None and outside_temp is not None:
+            return inside_temp, outside_temp
+        
+        # Each bus read blocks ~750 ms: requests arriving back to back (several tabs, dashboard
+        # then /state) share one read instead of each stalling the main loop again
+        read_at, temps = self._temps_cache
+        if temps is not None and time.ticks_diff(time.ticks_ms(), read_at) < 1000:
+            return (temps[0] if inside_temp is None else inside_temp,
+                    temps[1] if outside_temp is None else outside_temp)
+        
+        if inside_temp is None:
+            inside_temps = sensors['inside'].read_all_temps(unit='F')
+            inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
+        
+        if outside_temp is None:
+            outside_temps = sensors['outside'].read_all_temps(unit='F')
+            outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
+        
+        self._temps_cache = (time.ticks_ms(), (inside_temp, outside_temp))
+        return inside_temp, outside_temp
+
+    def _status_etag(self, temps, states, ac_monitor, heater_monitor, config):
+        """Build dashboard ETag from everything the page displays (minute resolution for timers)."""
+        inside_temp, outside_temp = temps
+        key = (
+            _fmt_temp(inside_temp),
+            _fmt_temp(outside_temp),
+            states,
+            self._status_strings(ac_monitor, heater_monitor),
+            config.get('schedule_enabled'),
+            config.get('permanent_hold'),
+            self._config_rev,
+            int(time.time() // 60)  # Hold countdown / active schedule change by the minute
+        )
+        return '"{}"'.format(self._tag('etag', key))
+
+    def _status_strings(self, ac_monitor, heater_monitor):
+        """Return (ac_target, ac_swing, heater_target, heater_swing) as display strings."""
+        if ac_monitor:
+            ac_target, ac_swing = str(ac_monitor.target_temp), str(ac_monitor.temp_swing)
+        else:
+            ac_target = ac_swing = "N/A"
+        if heater_monitor:
+            heater_target, heater_swing = str(heater_monitor.target_temp), str(heater_monitor.temp_swing)
+        else:
+            heater_target = heater_swing = "N/A"
+        return ac_target, ac_swing, heater_target, heater_swing
+
+    def _time_str(self):
+        """Current local time as displayed on the dashboard (RTC read + format at most once per minute)."""
+        t = time.time()
+        minute = int(t // 60)
+        if minute != self._time_cache[0]:
+            self._time_cache = (minute, "%d-%02d-%02d %02d:%02d" % time.localtime(t)[:5])
+        return self._time_cache[1]
+
+    def _temp_hold_remaining(self, config):
+        """Countdown suffix for the temporary hold banner ("" if the hold has no start time)."""
+        # Timer comes from CONFIG (not schedule_monitor)
+        temp_hold_start = config.get('temp_hold_start_time')
+        if temp_hold_start is None:
+            return ""
+        remaining = config.get('temp_hold_duration', 3600) - (time.time() - temp_hold_start)
+        mins_remaining = int(remaining // 60)
+        if remaining <= 0:
+            return " - Resuming..."  # Timer expired (should auto-resume soon)
+        if mins_remaining > 60:
+            return " - %dh %dm remaining" % divmod(mins_remaining, 60)
+        if mins_remaining > 1:
+            return " - %d min remaining" % mins_remaining
+        # Last two minutes: singular "minute", then a seconds countdown
+        return " - 1 minute remaining" if mins_remaining else " - %ds remaining" % int(remaining)
+
+    def _state_version(self, config, mode):
+        """Tag of the dashboard parts /dash.js cannot patch; the page reloads when it changes."""
+        if mode == _MODE_AUTO:
+            extra = self._active_schedule_name(config.get('schedules', []))
+        elif mode == _MODE_TEMP_HOLD:
+            extra = int(time.time() // 60)  # Hold countdown ticks by the minute
+        else:
+            extra = None
+        return self._tag('version', (self._config_rev, mode, config.get('permanent_hold'), extra))
 
-            if response is None:
-                response = self._get_status_page(sensors, ac_monitor, heater_monitor, schedule_monitor)
-            
-            # ===== START: Send response with proper HTTP headers =====
-            print("DEBUG: Sending response ({} bytes)".format(len(response.encode('utf-8'))))
-            try:
-                # Check if response already has HTTP headers (like redirects)
-                if response.startswith('HTTP/1.1'):
-                    # Response already has headers (redirect or other), send as-is
-                    conn.sendall(response.encode('utf-8'))
-                else:
-                    # HTML response needs headers added first
-                    conn.sendall(b'HTTP/1.1 200 OK\r\n')
-                    conn.sendall(b'Content-Type: text/html; charset=utf-8\r\n')
-                    conn.sendall('Content-Length: {}\r\n'.format(len(response.encode('utf-8'))).encode('utf-8'))
-                    conn.sendall(b'Connection: close\r\n')
-                    conn.sendall(b'\r\n')  # Blank line separates headers from body
-                    conn.sendall(response.encode('utf-8'))
-                
-                print("DEBUG: Response sent successfully")
-            except Exception as e:
-                print("ERROR: Failed to send response: {}".format(e))
-            finally:
-                conn.close()
-                import gc  # type: ignore
-                gc.collect()
-                print("DEBUG: Client connection closed")
-            # ===== END: Send response =====
+    def _tag(self, slot, key):
+        """Short tag for `key` in `slot`: a fresh one whenever key changes.
 
-        except OSError:
-            pass
-        except Exception as e:
-            print("Web server error: {}".format(e))
-            import sys
-            sys.print_exception(e)
+        Keys are compared exactly - MicroPython str hashes are only 8-16 bits and a tuple's hash
+        is the sum of its items', so hash(key) would hand two different states the same tag.
+        """
+        last = self._tags.get(slot)
+        if last is not None and last[0] == key:
+            return last[1]
+        self._tag_seq += 1
+        tag = '{}{:x}'.format(self._boot_tag, self._tag_seq)
+        self._tags[slot] = (key, tag)
+        return tag
 
     def _build_sched_js(self):
         # Keep this as bytes; no .format() so no brace escaping and less RAM churn
@@ -226,22 +1582,38 @@ class TempWebServer:
     def _save_config_to_file(self, config):
         """Save configuration to config.json file (atomic write)."""
         try:
-            import os
+            if _DEBUG:
+                print("DEBUG: Saving config with {} schedules".format(len(config.get('schedules', []))))
+            
+            # main.py's boot dict is never loaded through here: migrate it before it is written
+            _decode_schedules(config)
             
-            print("DEBUG: Saving config with {} schedules".format(len(config.get('schedules', []))))
+            # Serialize once; skip the flash write if the file still holds exactly this
+            data = json.dumps(config)
+            saved_stamp, saved_data = self._saved_config
+            if data == saved_data:
+                try:
+                    if _config_stamp() == saved_stamp:
+                        return True
+                except OSError:
+                    pass
             
-            # Write to temp file first
             with open('config.tmp', 'w') as f:
-                json.dump(config, f)
+                f.write(data)
             
-            # Remove old config if exists
+            # Rename temp over config (atomic on littlefs; FAT needs the old file removed first)
             try:
+                os.rename('config.tmp', 'config.json')
+            except OSError:
                 os.remove('config.json')
-            except:
-                pass
+                os.rename('config.tmp', 'config.json')
+            self._config_rev += 1  # Invalidate dashboard ETag
             
-            # Rename temp to config (atomic on most filesystems)
-            os.rename('config.tmp', 'config.json')
+            # What we just wrote is the current config - no need to re-read it
+            stamp = _config_stamp()
+            self._cfg_cache = (stamp, config)
+            self._saved_config = (stamp, data)
+            self._cfg_checked = time.ticks_ms()
             
             # Update discord module in-memory config so webhook URLs are current
             try:
@@ -253,31 +1625,42 @@ class TempWebServer:
             return True
         except Exception as e:
             print("❌ Error saving config: {}".format(e))
-            import sys
-            sys.print_exception(e)
+            if self.DEBUG_TRACEBACKS:
+                sys.print_exception(e)
             return False
 
     def _load_config(self):
-        """Load configuration from file."""
+        """Load configuration (cached in memory, re-read only when config.json's mtime or size changes)."""
         try:
+            # Other writers (ScheduleMonitor) save at most once a minute: stat the file at most once a second
+            now = time.ticks_ms()
+            if self._cfg_cache[1] is not None and time.ticks_diff(now, self._cfg_checked) < 1000:
+                return self._cfg_cache[1]
+            self._cfg_checked = now
+            stamp = _config_stamp()
+            if stamp == self._cfg_cache[0]:
+                return self._cfg_cache[1]
             with open('config.json', 'r') as f:
-                return json.load(f)
+                config = json.load(f)
+            _decode_schedules(config)
+            self._cfg_cache = (stamp, config)
+            return config
         except Exception as e:
             print("Error loading config:", e)
             raise  # Or handle as appropriate
 
-    def _handle_schedule_update(self, request, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
-        """Handle schedule form submission."""
-        import gc  # type: ignore
+    def _handle_schedule_update(self, form, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        """Handle schedule form submission (list of (key, raw value) pairs)."""
         gc.collect()
         try:
-            body = request.split('\r\n\r\n')[1] if '\r\n\r\n' in request else ''
             params = {}
             
-            for pair in body.split('&'):
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    params[key] = value.replace('+', ' ')
+            for key, value in form:
+                try:
+                    params[key] = self._url_decode(value)
+                except UnicodeError:
+                    # One bad field (e.g. name=%FF) should not throw away the whole save
+                    print("Ignoring non-UTF-8 {}: {}".format(key, value))
             
             # ===== START: Handle mode actions =====
             mode_action = params.get('mode_action', '')
@@ -303,18 +1686,14 @@ class TempWebServer:
                 
                 # Send Discord notification
                 try:
-                    discord_webhook.send_discord_message("▶️ Schedule resumed - Automatic temperature control active")
+                    self._discord_queue.append("▶️ Schedule resumed - Automatic temperature control active")
                 except:
                     pass
                 
                 # Redirect back to Dashboard with proper headers
-                redirect_response = 'HTTP/1.1 303 See Other\r\n'
-                redirect_response += 'Location: /\r\n'
-                redirect_response += 'Content-Length: 0\r\n'
-                redirect_response += 'Connection: close\r\n'
-                redirect_response += '\r\n'
-                print("DEBUG: Returning redirect to dashboard")
-                return redirect_response
+                if _DEBUG:
+                    print("DEBUG: Returning redirect to dashboard")
+                return _REDIRECT_303_ROOT
             
             elif mode_action == 'temporary_hold':
                 gc.collect()
@@ -329,17 +1708,12 @@ class TempWebServer:
                         schedule_monitor.reload_config(config)
                 
                 try:
-                    discord_webhook.send_discord_message("⏸️ Temporary hold - Schedules paused, manual control active")
+                    self._discord_queue.append("⏸️ Temporary hold - Schedules paused, manual control active")
                 except:
                     pass
                 
                 # Redirect to dashboard after error (settings weren't saved)
-                redirect_response = 'HTTP/1.1 303 See Other\r\n'
-                redirect_response += 'Location: /\r\n'
-                redirect_response += 'Content-Length: 0\r\n'
-                redirect_response += 'Connection: close\r\n'
-                redirect_response += '\r\n'
-                return redirect_response
+                return _REDIRECT_303_ROOT
             
             elif mode_action == 'permanent_hold':
                 gc.collect()
@@ -354,18 +1728,14 @@ class TempWebServer:
                         schedule_monitor.reload_config(config)
                 
                 try:
-                    discord_webhook.send_discord_message("🛑 Permanent hold - Schedules disabled, manual control only")
+                    self._discord_queue.append("🛑 Permanent hold - Schedules disabled, manual control only")
                 except:
                     pass
                 
                 # Redirect back to Dashboard with proper headers
-                redirect_response = 'HTTP/1.1 303 See Other\r\n'
-                redirect_response += 'Location: /\r\n'
-                redirect_response += 'Content-Length: 0\r\n'
-                redirect_response += 'Connection: close\r\n'
-                redirect_response += '\r\n'
-                print("DEBUG: Returning redirect to dashboard")
-                return redirect_response
+                if _DEBUG:
+                    print("DEBUG: Returning redirect to dashboard")
+                return _REDIRECT_303_ROOT
             
             elif mode_action == 'save_schedules':
                 gc.collect()
@@ -383,150 +1753,32 @@ class TempWebServer:
             has_any_schedule_data = False
             
             for i in range(4):
-                time_key = 'schedule_{}_time'.format(i)
-                name_key = 'schedule_{}_name'.format(i)
-                ac_key = 'schedule_{}_ac'.format(i)
-                heater_key = 'schedule_{}_heater'.format(i)
+                time_key, name_key, ac_key, heater_key = _SCHED_KEYS[i]
                 
                 # Check if this schedule slot has data
                 if time_key in params or name_key in params or ac_key in params or heater_key in params:
                     has_any_schedule_data = True
                 
-                if time_key in params and params[time_key]:
-                    # ===== VALIDATE: If time is set, AC and Heater MUST be set =====
-                    if ac_key not in params or not params[ac_key]:
-                        print("❌ Validation failed: Schedule {} has time but missing AC target".format(i+1))
-                        return self._get_error_page(
-                            "Incomplete Schedule",
-                            "Schedule {}: AC target is required when time is set".format(i+1),
-                            sensors, ac_monitor, heater_monitor
-                        )
-                    
-                    if heater_key not in params or not params[heater_key]:
-                        print("❌ Validation failed: Schedule {} has time but missing Heater target".format(i+1))
-                        return self._get_error_page(
-                            "Incomplete Schedule",
-                            "Schedule {}: Heater target is required when time is set".format(i+1),
-                            sensors, ac_monitor, heater_monitor
-                        )
-                    # ===== END VALIDATION =====
-                    
-                    # URL decode the time (converts %3A back to :)
-                    schedule_time = params[time_key].replace('%3A', ':')
-                    
-                    # Validate time format
-                    if ':' not in schedule_time or len(schedule_time.split(':')) != 2:
-                        print("Invalid time format: {}".format(schedule_time))
-                        return self._get_error_page(
-                            "Invalid Time",
-                            "Schedule {}: Time format must be HH:MM".format(i+1),
-                            sensors, ac_monitor, heater_monitor
-                        )
-                    
-                    try:
-                        hours, mins = schedule_time.split(':')
-                        if not (0 <= int(hours) <= 23 and 0 <= int(mins) <= 59):
-                            raise ValueError
-                    except:
-                        print("Invalid time value: {}".format(schedule_time))
-                        return self._get_error_page(
-                            "Invalid Time",
-                            "Schedule {}: Invalid time value {}".format(i+1, schedule_time),
-                            sensors, ac_monitor, heater_monitor
-                        )
-                    
-                    # URL decode the name
-                    schedule_name = params.get(name_key, 'Schedule {}'.format(i+1)).replace('+', ' ')
-                    
-                    # Parse temperatures (they're guaranteed to exist due to validation above)
-                    try:
-                        ac_target = float(params[ac_key])
-                        heater_target = float(params[heater_key])
-                    except (ValueError, TypeError):
-                        return self._get_error_page(
-                            "Invalid Temperature",
-                            "Schedule {}: Temperature values must be numbers".format(i+1),
-                            sensors, ac_monitor, heater_monitor
-                        )
-                    # Sync using direction of change (no dependency on last_changed)
-                    prev_h = None
-                    prev_a = None
-                    if i < len(prev_schedules):
-                        try:
-                            prev_h = float(prev_schedules[i].get('heater_target', heater_target))
-                        except:
-                            prev_h = None
-                        try:
-                            prev_a = float(prev_schedules[i].get('ac_target', ac_target))
-                        except:
-                            prev_a = None
-                    delta_h = (heater_target - prev_h) if prev_h is not None else None
-                    delta_a = (ac_target - prev_a) if prev_a is not None else None
-
-                    if ac_target < heater_target:
-                        # AC moved down -> lower heater
-                        if delta_a is not None and delta_a < 0 and (delta_h is None or abs(delta_h) < 1e-9):
-                            heater_target = ac_target
-                        # Heater moved up -> raise AC
-                        elif delta_h is not None and delta_h > 0 and (delta_a is None or abs(delta_a) < 1e-9):
-                            ac_target = heater_target
-                        else:
-                            # Fallback preference: if AC decreased more, lower heater; else raise AC
-                            if delta_a is not None and delta_h is not None and abs(delta_a) > abs(delta_h):
-                                heater_target = ac_target
-                            else:
-                                ac_target = heater_target
-                    # Create schedule entry
-                    schedule = {
-                        'time': schedule_time,
-                        'name': schedule_name,
-                        'ac_target': ac_target,
-                        'heater_target': heater_target
-                    }
+                schedule, error = self._parse_one_schedule(params, i, prev_schedules)
+                if error:
+                    return self._get_error_page(error[0], error[1], sensors, ac_monitor, heater_monitor)
+                if schedule:
                     schedules.append(schedule)
             
             # Only update schedules if user submitted schedule form data
             if has_any_schedule_data:
                 config['schedules'] = schedules
+                config['schedule_format'] = _SCHEDULE_FORMAT  # Form values arrive decoded
                 print("Updating schedules: {} schedules configured".format(len(schedules)))
             else:
                 # No schedule data in form - preserve existing schedules
                 print("No schedule data in request - preserving existing schedules")
             
-            # ===== START: Validate all schedules =====
-            for i, schedule in enumerate(schedules):
-                heater_temp = schedule.get('heater_target', 80.0)
-                ac_temp = schedule.get('ac_target', 77.0)
-                
-                if heater_temp > ac_temp:
-                    print("❌ Schedule validation failed: Schedule {} has heater ({}) > AC ({})".format(
-                        i+1, heater_temp, ac_temp
-                    ))
-                    return self._get_error_page(
-                        "Invalid Schedule",
-                        "Schedule {} ({}): Heater target ({:.1f}°F) cannot be greater than AC target ({:.1f}°F)".format(
-                            i+1, schedule.get('name', 'Unnamed'), heater_temp, ac_temp
-                        ),
-                        sensors, ac_monitor, heater_monitor
-                    )
-            # ===== END: Validate all schedules =====
-            
             # Save to file
             if self._save_config_to_file(config):
                 print("Schedule configuration saved")
                 
-                # ===== ADD THIS: Reload config into memory immediately =====
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                        # Update the passed-in config dict (updates reference, not copy)
-                        config.clear()
-                        config.update(updated_config)
-                    print("✅ Config reloaded into memory")
-                except Exception as e:
-                    print("⚠️ Warning: Could not reload config: {}".format(e))
-                # ===== END: Reload config =====
-                
+                # config is the dict just written - no need to read it back from flash
                 if schedule_monitor:
                     schedule_monitor.reload_config(config)
                     
@@ -545,63 +1797,162 @@ class TempWebServer:
                 message = "📅 Schedules updated ({} mode) - {} schedules configured".format(
                     mode, len(schedules)
                 )
-                discord_webhook.send_discord_message(message)
+                self._discord_queue.append(message)
             except:
                 pass
             # ===== END: Handle schedule configuration save =====
             del schedules
             gc.collect()
             # Redirect back to homepage with cache-busting headers
-            redirect_response = 'HTTP/1.1 303 See Other\r\n'
-            redirect_response += 'Location: /\r\n'
-            redirect_response += 'Content-Length: 0\r\n'
-            redirect_response += 'Connection: close\r\n'
-            redirect_response += 'Cache-Control: no-cache, no-store, must-revalidate\r\n'
-            redirect_response += 'Pragma: no-cache\r\n'
-            redirect_response += 'Expires: 0\r\n'
-            redirect_response += '\r\n'
-            print("DEBUG: Returning redirect to dashboard (with cache-busting)")
-            gc.collect()
-            return redirect_response
+            if _DEBUG:
+                print("DEBUG: Returning redirect to dashboard (with cache-busting)")
+            return _REDIRECT_303_ROOT_NOCACHE
             
         except Exception as e:
             print("Error updating schedule: {}".format(e))
-            import sys
-            sys.print_exception(e)
+            if self.DEBUG_TRACEBACKS:
+                sys.print_exception(e)
             # Safety: avoid rendering an error page here; just redirect
-            redirect_response = 'HTTP/1.1 303 See Other\r\n'
-            redirect_response += 'Location: /schedule\r\n'
-            redirect_response += 'Content-Length: 0\r\n'
-            redirect_response += 'Connection: close\r\n'
-            redirect_response += '\r\n'
-            return redirect_response
-
-    def _handle_update(self, request, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
-        """Handle form submission and update settings."""
-        try:
-            body = request.split('\r\n\r\n')[1] if '\r\n\r\n' in request else ''
-            params = {}
+            return _REDIRECT_303_SCHEDULE
+
+    def _parse_one_schedule(self, params, i, prev_schedules):
+        """Validate schedule slot i of the decoded form; return (schedule dict or None, (title, message) or None)."""
+        time_key, name_key, ac_key, heater_key = _SCHED_KEYS[i]
+        if time_key in params and params[time_key]:
+            # ===== VALIDATE: If time is set, AC and Heater MUST be set =====
+            if ac_key not in params or not params[ac_key]:
+                print("❌ Validation failed: Schedule {} has time but missing AC target".format(i+1))
+                return None, (
+                    "Incomplete Schedule",
+                    "Schedule {}: AC target is required when time is set".format(i+1)
+                )
+            
+            if heater_key not in params or not params[heater_key]:
+                print("❌ Validation failed: Schedule {} has time but missing Heater target".format(i+1))
+                return None, (
+                    "Incomplete Schedule",
+                    "Schedule {}: Heater target is required when time is set".format(i+1)
+                )
+            # ===== END VALIDATION =====
+            
+            schedule_time = params[time_key]  # Already URL-decoded
+            
+            # Validate time format
+            if ':' not in schedule_time or len(schedule_time.split(':')) != 2:
+                print("Invalid time format: {}".format(schedule_time))
+                return None, (
+                    "Invalid Time",
+                    "Schedule {}: Time format must be HH:MM".format(i+1)
+                )
+            
+            try:
+                hours, mins = schedule_time.split(':')
+                if not (0 <= int(hours) <= 23 and 0 <= int(mins) <= 59):
+                    raise ValueError
+            except:
+                print("Invalid time value: {}".format(schedule_time))
+                return None, (
+                    "Invalid Time",
+                    "Schedule {}: Invalid time value {}".format(i+1, schedule_time)
+                )
+            
+            schedule_name = params.get(name_key, 'Schedule {}'.format(i+1))
+            
+            # Parse temperatures (they're guaranteed to exist due to validation above); plain
+            # decimals only, like the settings form, so 'nan'/'inf' never reach config.json
+            ac_target = _form_float(params[ac_key].encode('utf-8'))
+            heater_target = _form_float(params[heater_key].encode('utf-8'))
+            if ac_target is None or heater_target is None:
+                return None, (
+                    "Invalid Temperature",
+                    "Schedule {}: Temperature values must be numbers".format(i+1)
+                )
+            for label, value, (low, high) in (("Heater", heater_target, _SCHED_HEATER_RANGE),
+                                              ("AC", ac_target, _SCHED_AC_RANGE)):
+                if not low <= value <= high:
+                    return None, (
+                        "Invalid Temperature",
+                        "Schedule {}: {} target must be between {} and {}°F".format(i+1, label, low, high)
+                    )
+            # Sync using direction of change (no dependency on last_changed)
+            prev_h = None
+            prev_a = None
+            if i < len(prev_schedules):
+                try:
+                    prev_h = float(prev_schedules[i].get('heater_target', heater_target))
+                except:
+                    prev_h = None
+                try:
+                    prev_a = float(prev_schedules[i].get('ac_target', ac_target))
+                except:
+                    prev_a = None
+            delta_h = (heater_target - prev_h) if prev_h is not None else None
+            delta_a = (ac_target - prev_a) if prev_a is not None else None
+
+            if ac_target < heater_target:
+                # AC moved down -> lower heater
+                if delta_a is not None and delta_a < 0 and (delta_h is None or abs(delta_h) < 1e-9):
+                    heater_target = ac_target
+                # Heater moved up -> raise AC
+                elif delta_h is not None and delta_h > 0 and (delta_a is None or abs(delta_a) < 1e-9):
+                    ac_target = heater_target
+                else:
+                    # Fallback preference: if AC decreased more, lower heater; else raise AC
+                    if delta_a is not None and delta_h is not None and abs(delta_a) > abs(delta_h):
+                        heater_target = ac_target
+                    else:
+                        ac_target = heater_target
+            # ===== VALIDATE: Heater must not exceed AC (fail before touching config) =====
+            if heater_target > ac_target:
+                print("❌ Schedule validation failed: Schedule {} has heater ({}) > AC ({})".format(
+                    i+1, heater_target, ac_target
+                ))
+                return None, (
+                    "Invalid Schedule",
+                    "Schedule {} ({}): Heater target ({}°F) cannot be greater than AC target ({}°F)".format(
+                        i+1, schedule_name, _fmt_temp(heater_target), _fmt_temp(ac_target)
+                    )
+                )
             
-            for pair in body.split('&'):
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    # Don't convert hold_type to float
-                    if key == 'hold_type':
-                        params[key] = value
+            # Create schedule entry
+            schedule = {
+                'time': schedule_time,
+                'name': schedule_name,
+                'ac_target': ac_target,
+                'heater_target': heater_target
+            }
+            return schedule, None
+        return None, None
+
+    def _handle_update(self, form, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        """Handle form submission (list of (key, raw value) pairs) and update settings."""
+        gc.collect()
+        try:
+            parsed = [None, None, None, None]  # Same order as _UPDATE_FIELDS
+            hold_type = 'temp'  # Default to temp hold
+            
+            for key, value in form:
+                # Don't convert hold_type to float
+                if key == 'hold_type':
+                    hold_type = value.decode('utf-8')
+                elif key in _UPDATE_FIELDS:
+                    # A bad field keeps its current value instead of dropping the whole update
+                    v = _form_float(value)
+                    if v is None:
+                        print("Ignoring invalid {}: {}".format(key, value))
                     else:
-                        params[key] = float(value)
+                        parsed[_UPDATE_FIELDS.index(key)] = v
             
             # Check which hold button was clicked
-            hold_type = params.get('hold_type', 'temp')  # Default to temp hold
             is_permanent = (hold_type == 'perm')
             
             # ===== START: Validate Heat <= AC =====
-            new_heater_target = params.get('heater_target', config.get('heater_target', 80.0))
-            new_ac_target = params.get('ac_target', config.get('ac_target', 77.0))
+            new_ac_target = parsed[0] if parsed[0] is not None else config.get('ac_target', 77.0)
+            new_heater_target = parsed[2] if parsed[2] is not None else config.get('heater_target', 80.0)
             
-            # Use previous values to detect direction of change
-            old_heater = float(config.get('heater_target', new_heater_target))
-            old_ac = float(config.get('ac_target', new_ac_target))
+            # Previous values (monitors are the source of truth) to detect direction of change
+            old_ac = ac_monitor.target_temp if ac_monitor else float(config.get('ac_target', new_ac_target))
+            old_heater = heater_monitor.target_temp if heater_monitor else float(config.get('heater_target', new_heater_target))
 
             # If AC is below heater, sync based on the field that moved
             if new_ac_target < new_heater_target:
@@ -617,24 +1968,26 @@ class TempWebServer:
                         new_heater_target = new_ac_target
                     else:
                         new_ac_target = new_heater_target
-
-            # Reflect adjusted values back to params
-            params['ac_target'] = new_ac_target
-            params['heater_target'] = new_heater_target
             # ===== END: Validate Heat <= AC =====
             
             # ===== START: Update AC Settings =====
-            if 'ac_target' in params and ac_monitor:
-                ac_monitor.target_temp = params['ac_target']
-                config['ac_target'] = params['ac_target']
-                print("AC target updated to {}°F".format(params['ac_target']))
+            if ac_monitor:
+                ac_monitor.target_temp = new_ac_target
+                config['ac_target'] = new_ac_target
+                print("AC target updated to {}°F".format(new_ac_target))
+                if parsed[1] is not None:
+                    ac_monitor.temp_swing = parsed[1]
+                    config['ac_swing'] = parsed[1]
             # ===== END: Update AC Settings =====
             
             # ===== START: Update Heater Settings =====
-            if 'heater_target' in params and heater_monitor:
-                heater_monitor.target_temp = params['heater_target']
-                config['heater_target'] = params['heater_target']
-                print("Heater target updated to {}°F".format(params['heater_target']))
+            if heater_monitor:
+                heater_monitor.target_temp = new_heater_target
+                config['heater_target'] = new_heater_target
+                print("Heater target updated to {}°F".format(new_heater_target))
+                if parsed[3] is not None:
+                    heater_monitor.temp_swing = parsed[3]
+                    config['heater_swing'] = parsed[3]
             # ===== END: Update Heater Settings =====
             
             # ===== START: Enter hold mode based on button clicked =====
@@ -651,1159 +2004,373 @@ class TempWebServer:
                 print("⏸️ Temporary hold activated - Manual override (1 hour)")
             
             # Reload schedule monitor to disable it
-            if schedule_monitor:
-                schedule_monitor.reload_config(config)
-            # ===== END: Enter hold mode =====
-
-            
-            # ===== START: Save settings to file =====
-            if self._save_config_to_file(config):
-                print("Settings persisted to disk")
-                
-                # ===== RELOAD config into memory immediately =====
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                        config.clear()
-                        config.update(updated_config)
-                    print("✅ Config reloaded into memory")
-                except Exception as e:
-                    print("⚠️ Warning: Could not reload config: {}".format(e))
-                # ===== END: Reload config =====
-            # ===== END: Save settings to file =====
-            
-            # ===== START: Send Discord notification =====
-            try:
-                hold_label = "PERMANENT HOLD" if is_permanent else "TEMPORARY HOLD"
-                duration = "" if is_permanent else " (1 hour)"
-                
-                message = "{} {} - AC: {}°F | Heater: {}°F{}".format(
-                    "🛑" if is_permanent else "⏸️",
-                    hold_label,
-                    params.get('ac_target', 'N/A'),
-                    params.get('heater_target', 'N/A'),
-                    duration
-                )
-                discord_webhook.send_discord_message(message)
-            except Exception as discord_error:
-                print("Discord notification failed: {}".format(discord_error))
-            # ===== END: Send Discord notification =====
-            
-        except Exception as e:
-            print("Error updating settings: {}".format(e))
-            import sys
-            sys.print_exception(e)
-        
-        return self._get_status_page(sensors, ac_monitor, heater_monitor, schedule_monitor, show_success=True)
-
-    def _get_status_page(self, sensors, ac_monitor, heater_monitor, schedule_monitor=None, show_success=False):
-        """Generate HTML status page."""
-        print("DEBUG: Generating status page...")
-        
-        # ===== FORCE GARBAGE COLLECTION BEFORE BIG ALLOCATION =====
-        import gc # type: ignore
-        gc.collect()
-        try:
-            mf = gc.mem_free()  # type: ignore
-            print("DEBUG: Memory freed, {} bytes available".format(mf))
-        except Exception:
-            print("DEBUG: Memory collected")
-        # ===== END GARBAGE COLLECTION =====
-        
-        try:
-            # Get current temperatures (use cached values to avoid blocking)
-            inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
-            outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
-            
-            # Fallback to sensor read if no cached value (first load only)
-            if inside_temp is None:
-                inside_temps = sensors['inside'].read_all_temps(unit='F')
-                inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
-            
-            if outside_temp is None:
-                outside_temps = sensors['outside'].read_all_temps(unit='F')
-                outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
-            
-            # Get AC/Heater status
-            ac_status = "ON" if ac_monitor and ac_monitor.ac.get_state() else "OFF"
-            heater_status = "ON" if heater_monitor and heater_monitor.heater.get_state() else "OFF"
-            
-            # Get current time
-            current_time = time.localtime()
-            time_str = "{}-{:02d}-{:02d} {:02d}:{:02d}:{:02d}".format(
-                current_time[0], current_time[1], current_time[2], 
-                current_time[3], current_time[4], current_time[5]
-            )
-            
-            # Load config
-            config = self._load_config()
-            
-            # ===== START: Determine schedule status display =====
-            has_schedules = len([s for s in config.get('schedules', []) if s.get('time')]) > 0
-            
-            if not has_schedules:
-                schedule_status = "NO SCHEDULES"
-                schedule_color = "#95a5a6"
-                schedule_icon = "⚠️"
-            elif config.get('schedule_enabled'):
-                schedule_status = "AUTOMATIC"
-                schedule_color = "#2ecc71"
-                schedule_icon = "✅"
-            elif config.get('permanent_hold', False):
-                schedule_status = "PERMANENT HOLD"
-                schedule_color = "#e74c3c"
-                schedule_icon = "🛑"
-            else:
-                schedule_status = "TEMPORARY HOLD"
-                schedule_color = "#f39c12"
-                schedule_icon = "⏸️"
-            # ===== END: Determine schedule status display =====
-            
-            # Build schedule cards
-            schedule_cards = ""
-            
-            # Build mode buttons for dashboard
-            mode_buttons = self._build_mode_buttons(config)
-            if config.get('schedules'):
-                for schedule in config.get('schedules', []):
-                    # ===== START: Decode URL-encoded values =====
-                    # Replace %3A with : and + with space
-                    time_value = schedule.get('time', 'N/A').replace('%3A', ':')
-                    name_value = schedule.get('name', 'Unnamed').replace('+', ' ')
-                    # ===== END: Decode URL-encoded values =====
-                    
-                    schedule_cards += """
-                    <div style="background: #f8f9fa; padding: 15px; border-radius: 8px;">
-                        <div style="font-weight: bold; color: #34495e; margin-bottom: 5px;">
-                            🕐 {time} - {name}
-                        </div>
-                        <div style="color: #7f8c8d; font-size: 14px;">
-                            Heat: {heater_temp}°F | AC: {ac_temp}°F
-                        </div>
-                    </div>
-                    """.format(
-                        time=time_value,      # Use decoded value
-                        name=name_value,      # Use decoded value
-                        ac_temp=schedule.get('ac_target', 'N/A'),
-                        heater_temp=schedule.get('heater_target', 'N/A')
-                    )
-            else:
-                schedule_cards = """
-                <div style="text-align: center; color: #95a5a6; grid-column: 1 / -1;">
-                    No schedules configured
-                </div>
-                """
-            
-            # Success message
-            success_html = """
-            <div class="success-message">
-                ✅ Settings updated successfully!
-            </div>
-            """ if show_success else ""
-            
-            # Format temperature values
-            inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-            outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
-            
-          # ===== START: Add HOLD mode banner with countdown timer =====
-            hold_banner = ""
-            
-            # Calculate remaining time for temporary hold
-            temp_hold_remaining = ""
-            if not config.get('schedule_enabled', False) and not config.get('permanent_hold', False):
-                # In temporary hold - check timer from CONFIG (not schedule_monitor)
-                temp_hold_start = config.get('temp_hold_start_time')  # READ FROM CONFIG
-                
-                if temp_hold_start is not None:
-                    # Get hold duration from config
-                    temp_hold_duration = config.get('temp_hold_duration', 3600)
-                    
-                    # Calculate elapsed time
-                    elapsed = time.time() - temp_hold_start
-                    # Calculate remaining time
-                    remaining = temp_hold_duration - elapsed
-                    
-                    if remaining > 0:
-                        # Convert to minutes
-                        mins_remaining = int(remaining // 60)
-                        
-                        # Format the display text
-                        if mins_remaining > 60:
-                            # Show hours and minutes for long durations
-                            hours = mins_remaining // 60
-                            mins = mins_remaining % 60
-                            temp_hold_remaining = " - {}h {}m remaining".format(hours, mins)
-                        elif mins_remaining > 1:
-                            # Show just minutes
-                            temp_hold_remaining = " - {} min remaining".format(mins_remaining)
-                        elif mins_remaining == 1:
-                            # Show singular "minute"
-                            temp_hold_remaining = " - 1 minute remaining"
-                        else:
-                            # Less than 1 minute left
-                            secs_remaining = int(remaining)
-                            temp_hold_remaining = " - {}s remaining".format(secs_remaining)
-                    else:
-                        # Timer expired (should auto-resume soon)
-                        temp_hold_remaining = " - Resuming..."
-            
-            if config.get('permanent_hold', False):
-                # PERMANENT HOLD - No timer, stays until user resumes or reboot
-                hold_banner = """
-                <div style="background: linear-gradient(135deg, #e74c3c, #c0392b); color: white; padding: 15px; border-radius: 10px; text-align: center; font-weight: bold; margin-bottom: 20px; box-shadow: 0 4px 8px rgba(0,0,0,0.2); animation: fadeIn 0.5s;">
-                    🛑 PERMANENT HOLD - Schedules disabled (Manual control only)
-                </div>
-                """
-            elif not config.get('schedule_enabled', False) and has_schedules:
-                # TEMPORARY HOLD - Show countdown timer
-                hold_banner = """
-                <div style="background: linear-gradient(135deg, #f39c12, #e67e22); color: white; padding: 15px; border-radius: 10px; text-align: center; font-weight: bold; margin-bottom: 20px; box-shadow: 0 4px 8px rgba(0,0,0,0.2); animation: fadeIn 0.5s;">
-                    ⏸️ TEMPORARY HOLD - Manual override active{remaining}
-                </div>
-                """.format(remaining=temp_hold_remaining)
-            # ===== END: Add HOLD mode banner with countdown timer =====
-            # Final HTML assembly
-            html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>🌱 Auto Garden</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <meta http-equiv="refresh" content="30">
-    <meta charset="utf-8">
-    <style>
-        * {{ margin: 0; padding: 0; box-sizing: border-box; }}
-        body {{
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
-            max-width: 1200px;
-            margin: 0 auto;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        h1 {{
-            color: white;
-            text-align: center;
-            font-size: 36px;
-            margin-bottom: 30px;
-            text-shadow: 2px 2px 4px rgba(0,0,0,0.2);
-        }}
-        .temp-grid {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 20px;
-            margin-bottom: 20px;
-        }}
-        .card {{
-            background: white;
-            border-radius: 15px;
-            padding: 25px;
-            box-shadow: 0 8px 16px rgba(0,0,0,0.2);
-            transition: transform 0.2s;
-        }}
-        .card:hover {{ transform: translateY(-5px); }}
-        .card.full-width {{ margin: 15px 0; }}
-        .temp-icon {{ font-size: 64px; text-align: center; margin-bottom: 15px; }}
-        .temp-display {{
-            font-size: 56px;
-            font-weight: bold;
-            text-align: center;
-            margin: 15px 0;
-            font-family: 'Courier New', monospace;
-        }}
-        .inside {{ color: #e74c3c; text-shadow: 2px 2px 4px rgba(231, 76, 60, 0.3); }}
-        .outside {{ color: #3498db; text-shadow: 2px 2px 4px rgba(52, 152, 219, 0.3); }}
-        .label {{
-            font-size: 20px;
-            color: #34495e;
-            text-align: center;
-            margin-bottom: 10px;
-            font-weight: 600;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-        .status {{
-            display: flex;
-            justify-content: space-around;
-            margin-top: 20px;
-            flex-wrap: wrap;
-            gap: 20px;
-        }}
-        .status-item {{ text-align: center; flex: 1; min-width: 200px; }}
-        .status-icon {{ font-size: 48px; margin-bottom: 10px; }}
-        .status-indicator {{
-            font-size: 22px;
-            font-weight: bold;
-            padding: 15px 30px;
-            border-radius: 25px;
-            display: inline-block;
-            margin-top: 10px;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-            transition: all 0.3s;
-        }}
-        .status-indicator:hover {{ transform: scale(1.05); }}
-        .on {{
-            background: linear-gradient(135deg, #2ecc71, #27ae60);
-            color: white;
-            animation: pulse 2s infinite;
-        }}
-        .off {{ background: linear-gradient(135deg, #95a5a6, #7f8c8d); color: white; }}
-        @keyframes pulse {{ 0%, 100% {{ opacity: 1; }} 50% {{ opacity: 0.8; }} }}
-        .controls {{
-            margin-top: 20px;
-            padding: 20px;
-            background: #f8f9fa;
-            border-radius: 10px;
-        }}
-        .control-group {{ margin: 15px 0; }}
-        .control-label {{
-            display: block;
-            font-size: 16px;
-            font-weight: 600;
-            color: #34495e;
-            margin-bottom: 8px;
-        }}
-        input[type="number"], input[type="time"], input[type="text"] {{
-            width: 100%;
-            padding: 12px;
-            font-size: 18px;
-            border: 2px solid #ddd;
-            border-radius: 8px;
-            transition: border-color 0.3s;
-        }}
-        input[type="number"]:focus, input[type="time"]:focus, input[type="text"]:focus {{
-            outline: none;
-            border-color: #667eea;
-        }}
-        .btn {{
-            width: 100%;
-            padding: 15px;
-            font-size: 18px;
-            font-weight: bold;
-            color: white;
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            border: none;
-            border-radius: 10px;
-            cursor: pointer;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-            transition: transform 0.2s;
-        }}
-        .btn:hover {{ transform: translateY(-2px); }}
-        .btn:active {{ transform: translateY(0); }}
-        .success-message {{
-            background: #2ecc71;
-            color: white;
-            padding: 15px;
-            border-radius: 10px;
-            text-align: center;
-            font-weight: bold;
-            margin-bottom: 20px;
-            animation: fadeIn 0.5s;
-        }}
-        @keyframes fadeIn {{ from {{ opacity: 0; }} to {{ opacity: 1; }} }}
-        .footer {{
-            text-align: center;
-            color: white;
-            margin-top: 30px;
-            font-size: 14px;
-            text-shadow: 1px 1px 2px rgba(0,0,0,0.2);
-        }}
-        .targets {{
-            font-size: 15px;
-            color: #7f8c8d;
-            text-align: center;
-            margin-top: 12px;
-            font-weight: 500;
-        }}
-        .degree {{ font-size: 0.6em; vertical-align: super; }}
-        .schedule-row {{
-            display: grid;
-            grid-template-columns: 1fr 2fr 1fr 1fr;
-            gap: 10px;
-            margin-bottom: 15px;
-            padding: 15px;
-            background: white;
-            border-radius: 8px;
-        }}
-        .toggle-switch {{
-            position: relative;
-            display: inline-block;
-            width: 60px;
-            height: 34px;
-        }}
-        .toggle-switch input {{ opacity: 0; width: 0; height: 0; }}
-        .slider {{
-            position: absolute;
-            cursor: pointer;
-            top: 0;
-            left: 0;
-            right: 0;
-            bottom: 0;
-            background-color: #ccc;
-            transition: .4s;
-            border-radius: 34px;
-        }}
-        .slider:before {{
-            position: absolute;
-            content: "";
-            height: 26px;
-            width: 26px;
-            left: 4px;
-            bottom: 4px;
-            background-color: white;
-            transition: .4s;
-            border-radius: 50%;
-        }}
-        input:checked + .slider {{ background-color: #2ecc71; }}
-        input:checked + .slider:before {{ transform: translateX(26px); }}
-        @media (max-width: 768px) {{
-            .temp-grid {{ grid-template-columns: 1fr; }}
-            .status {{ flex-direction: column; }}
-            .schedule-row {{ grid-template-columns: 1fr; }}
-        }}
-    </style>
-</head>
-<body>
-    <h1>🌱 Auto Garden Dashboard</h1>
-    
-    {hold_banner}
-    {success_message}
-    
-    <div class="temp-grid">
-        <div class="card temp-card">
-            <div class="temp-icon">🏠</div>
-            <div class="label">Indoor Climate</div>
-            <div class="temp-display inside">{inside_temp}<span class="degree">°F</span></div>
-        </div>
-        
-        <div class="card temp-card">
-            <div class="temp-icon">🌤️</div>
-            <div class="label">Outdoor Climate</div>
-            <div class="temp-display outside">{outside_temp}<span class="degree">°F</span></div>
-        </div>
-    </div>
-    
-    <div class="card full-width">
-        <div class="status">
-            <!-- ===== HEATER FIRST (LEFT) ===== -->
-            <div class="status-item">
-                <div class="status-icon">🔥</div>
-                <div class="label">Heating System</div>
-                <div class="status-indicator {heater_class}">{heater_status}</div>
-                <div class="targets">Target: {heater_target}°F ± {heater_swing}°F</div>
-            </div>
-            <!-- ===== AC SECOND (RIGHT) ===== -->
-            <div class="status-item">
-                <div class="status-icon">❄️</div>
-                <div class="label">Air Conditioning</div>
-                <div class="status-indicator {ac_class}">{ac_status}</div>
-                <div class="targets">Target: {ac_target}°F ± {ac_swing}°F</div>
-            </div>
-        </div>
-        
-                <form method="POST" action="/update" class="controls">
-            <h2 style="text-align: center; color: #34495e; margin-bottom: 20px;">🎯 Adjust Hold Settings</h2>
-            <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 20px;">
-                <!-- ===== LEFT COLUMN: Heater ===== -->
-                <div>
-                    <div class="control-group">
-                        <label class="control-label">🔥 Heater Target (°F)</label>
-                        <input type="number" name="heater_target" value="{heater_target}" step="0.5" min="60" max="85">
-                    </div>
-                </div>
-                
-                <!-- ===== RIGHT COLUMN: AC ===== -->
-                <div>
-                    <div class="control-group">
-                        <label class="control-label">❄️ AC Target (°F)</label>
-                        <input type="number" name="ac_target" value="{ac_target}" step="0.5" min="60" max="85">
-                    </div>
-                </div>
-            </div>
-            
-            <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin-top: 20px;">
-                <button type="submit" name="hold_type" value="temp" class="btn" style="background: linear-gradient(135deg, #f39c12, #e67e22);">
-                    ⏸️ Temp Hold
-                </button>
-                <button type="submit" name="hold_type" value="perm" class="btn" style="background: linear-gradient(135deg, #e74c3c, #c0392b);">
-                    🛑 Perm Hold
-                </button>
-            </div>
-        </form>
-    </div>
-    
-    <div class="card full-width">
-        <h2 style="text-align: center; color: #34495e; margin-bottom: 20px;">📅 Daily Schedule</h2>
-        <div style="text-align: center; margin-bottom: 15px;">
-            <strong>Status:</strong> 
-            <span style="color: {schedule_color}; font-weight: bold;">
-                {schedule_status} {schedule_icon}
-            </span>
-        </div>
-        <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 15px; margin-bottom: 20px;">
-            {schedule_cards}
-        </div>
-        {mode_buttons}
-        
-        <div style="display: grid; grid-template-columns: repeat(2, 1fr); gap: 15px; margin-top: 20px;">
-            <a href="/schedule" class="btn" style="text-decoration: none; display: inline-block;">
-                📅 Edit Schedules
-            </a>
-            <a href="/settings" class="btn" style="text-decoration: none; display: inline-block; background: linear-gradient(135deg, #95a5a6, #7f8c8d);">
-                ⚙️ Advanced Settings
-            </a>
-        </div>
-    </div>
-    
-    <div class="footer">
-        ⏰ Last updated: {time}<br>
-        🔄 Auto-refresh every 30 seconds
-    </div>
-<script>
-document.addEventListener('DOMContentLoaded', function() {{
-    var heaterInput = document.querySelector('input[name="heater_target"]');
-    var acInput = document.querySelector('input[name="ac_target"]');
-    if (heaterInput && acInput) {{
-        heaterInput.addEventListener('input', function() {{
-            var heaterVal = parseFloat(heaterInput.value);
-            var acVal = parseFloat(acInput.value);
-            if (!isNaN(heaterVal) && heaterVal > acVal) {{
-                acInput.value = heaterVal;
-            }}
-        }});
-        acInput.addEventListener('input', function() {{
-            var heaterVal = parseFloat(heaterInput.value);
-            var acVal = parseFloat(acInput.value);
-            if (!isNaN(acVal) && acVal < heaterVal) {{
-                heaterInput.value = acVal;
-            }}
-        }});
-    }}
-}});
-</script>
-</body>
-</html>
-            """.format(
-                hold_banner=hold_banner,
-                success_message=success_html,
-                inside_temp=inside_temp_str,
-                outside_temp=outside_temp_str,
-                ac_status=ac_status,
-                ac_class="on" if ac_status == "ON" else "off",
-                heater_status=heater_status,
-                heater_class="on" if heater_status == "ON" else "off",
-                ac_target=ac_monitor.target_temp if ac_monitor else "N/A",
-                ac_swing=ac_monitor.temp_swing if ac_monitor else "N/A",
-                heater_target=heater_monitor.target_temp if heater_monitor else "N/A",
-                heater_swing=heater_monitor.temp_swing if heater_monitor else "N/A",
-                time=time_str,
-                schedule_status=schedule_status,
-                schedule_color=schedule_color,
-                schedule_icon=schedule_icon,
-                schedule_cards=schedule_cards,
-                mode_buttons=mode_buttons
-            )
-            self.last_page_render = time.time()  # Track successful render
-            return html
+            if schedule_monitor:
+                schedule_monitor.reload_config(config)
+            # ===== END: Enter hold mode =====
+
+            
+            # ===== START: Save settings to file =====
+            if self._save_config_to_file(config):
+                print("Settings persisted to disk")  # config already holds what was written
+            # ===== END: Save settings to file =====
+            
+            # ===== START: Send Discord notification =====
+            try:
+                hold_label = "PERMANENT HOLD" if is_permanent else "TEMPORARY HOLD"
+                duration = "" if is_permanent else " (1 hour)"
+                
+                message = "{} {} - AC: {}°F | Heater: {}°F{}".format(
+                    "🛑" if is_permanent else "⏸️",
+                    hold_label,
+                    new_ac_target,
+                    new_heater_target,
+                    duration
+                )
+                self._discord_queue.append(message)
+            except Exception as discord_error:
+                print("Discord notification failed: {}".format(discord_error))
+            # ===== END: Send Discord notification =====
+            
+        except Exception as e:
+            print("Error updating settings: {}".format(e))
+            if self.DEBUG_TRACEBACKS:
+                sys.print_exception(e)
+        
+        return None  # Caller streams the dashboard with the success banner
+
+    def _get_status_page(self, conn, sensors, ac_monitor, heater_monitor, schedule_monitor=None, show_success=False, temps=None, states=None, extra_headers=''):
+        """Stream the HTML status page to conn, chunk by chunk, and close it."""
+        if _DEBUG:
+            print("DEBUG: Generating status page...")
+        
+        # No up-front gc.collect(): the template is a module constant and the page is streamed,
+        # so rendering only allocates the field values (_send_parts collects after sending)
+        
+        try:
+            # Get current temperatures (use cached values to avoid blocking)
+            if temps is None:
+                temps = self._current_temps(sensors)
+            inside_temp, outside_temp = temps
+            
+            # Get AC/Heater status (read by the caller when it already built the ETag)
+            heater_on, ac_on = states or _relay_states(ac_monitor, heater_monitor)
+            ac_status, ac_class = _STATE[ac_on]
+            heater_status, heater_class = _STATE[heater_on]
+            
+            # Load config
+            config = self._load_config()
+            
+            # Schedule mode selects the pre-encoded status badge and mode block
+            mode = _sched_mode(config)
+            
+            # Format temperature values
+            inside_temp_str = _fmt_temp(inside_temp)
+            outside_temp_str = _fmt_temp(outside_temp)
+            
+            ac_target, ac_swing, heater_target, heater_swing = self._status_strings(ac_monitor, heater_monitor)
+            
+            # Signature of everything displayed. Time-derived parts are keyed by their rendered text:
+            # the minute clock (active schedule) and the hold countdown (per second only near its end)
+            time_str = self._time_str()
+            temp_hold_remaining = self._temp_hold_remaining(config) if mode == _MODE_TEMP_HOLD else ""
+            key = (inside_temp_str, outside_temp_str, heater_on, ac_on, heater_target, heater_swing,
+                   ac_target, ac_swing, mode, config.get('permanent_hold'),
+                   config.get('schedule_enabled'), self._config_rev, time_str, temp_hold_remaining)
+            cached_values, cached_time, cached_key = self._page_cache
+            if not show_success and cached_key == key:
+                # Same page: reuse the encoded values, swapping in the clock if it moved on
+                values = cached_values
+                if time_str is not cached_time:
+                    values = list(values)
+                    values[_STATUS_TIME_SLOT] = time_str.encode('utf-8')
+                    self._page_cache = (values, time_str, key)
+            else:
+            
+                # Build mode buttons for dashboard
+                mode_buttons = self._build_mode_buttons(config, mode)
+                
+                # Schedule cards only change with the schedules: reuse the joined bytes until then
+                schedules = config.get('schedules')
+                cached_schedules, cached_rev, schedule_cards = self._cards_cache
+                if cached_schedules is not schedules or cached_rev != self._config_rev:
+                    if schedules:
+                        cards = []  # Encoded chunks, joined once
+                        p = _SCHED_CARD  # Fields in template order: time, name, heater, ac
+                        for schedule in schedules:
+                            # Values are stored decoded, not HTML-safe (form input or a hand-edited
+                            # config.json): escape them here, once per cards rebuild
+                            cards.extend((p[0], _html_escape(str(schedule.get('time', 'N/A'))).encode('utf-8'), p[2],
+                                          _html_escape(str(schedule.get('name', 'Unnamed'))).encode('utf-8'),
+                                          p[4], _html_escape(str(schedule.get('heater_target', 'N/A'))).encode('utf-8'),
+                                          p[6], _html_escape(str(schedule.get('ac_target', 'N/A'))).encode('utf-8'), p[8]))
+                        schedule_cards = b''.join(cards)
+                        del cards
+                    else:
+                        schedule_cards = _NO_SCHEDULES_CARD
+                    self._cards_cache = (schedules, self._config_rev, schedule_cards)
+            
+                # Success message
+                success_html = _SUCCESS_HTML if show_success else b""
+            
+              # ===== START: Add HOLD mode banner with countdown timer =====
+                hold_banner = ""
+            
+                if config.get('permanent_hold', False):
+                    # PERMANENT HOLD - No timer, stays until user resumes or reboot
+                    hold_banner = _PERMANENT_HOLD_BANNER
+                elif mode == _MODE_TEMP_HOLD:
+                    # TEMPORARY HOLD - Show countdown timer
+                    hold_banner = _TEMP_HOLD_BANNER_FMT % temp_hold_remaining
+                # ===== END: Add HOLD mode banner with countdown timer =====
+                # Final HTML assembly
+                ctx = {
+                    'hold_banner': hold_banner,
+                    'success_message': success_html,
+                    'inside_temp': inside_temp_str,
+                    'outside_temp': outside_temp_str,
+                    'ac_status': ac_status,
+                    'ac_class': ac_class,
+                    'heater_status': heater_status,
+                    'heater_class': heater_class,
+                    'ac_target': ac_target,
+                    'ac_swing': ac_swing,
+                    'heater_target': heater_target,
+                    'heater_swing': heater_swing,
+                    'time': time_str,
+                    'schedule_badge': _SCHED_BADGE[mode],
+                    'schedule_cards': schedule_cards,
+                    'mode_buttons': mode_buttons,
+                    'state_v': self._state_version(config, mode)
+                }
+                values = [ctx[_STATUS_PARTS[i]] for i in range(1, len(_STATUS_PARTS), 2)]
+                values = [v if isinstance(v, bytes) else v.encode('utf-8') for v in values]
+                if not show_success:
+                    self._page_cache = (values, time_str, key)
             
         except Exception as e:
-            print("Error generating page: {}".format(e))
-            import sys
+            self._send_fallback(conn, e)
+            return
+        
+        if self._send_parts(conn, _STATUS_PARTS, values, extra_headers):
+            self.last_page_render = time.time()  # Track successful render
+
+    def _send_fallback(self, conn, e):
+        """Log a dashboard failure and stream the bare error page instead."""
+        print("Error generating page: {}".format(e))
+        if self.DEBUG_TRACEBACKS:
             sys.print_exception(e)
-            return "<html><body><h1>Error loading page</h1><pre>{}</pre></body></html>".format(str(e))
+        self._send_parts(conn, _FALLBACK_PARTS, (_html_escape(str(e)).encode('utf-8'),))
+
+    def _send_parts(self, conn, parts, values, extra_headers=''):
+        """Stream a _split_template() page: literal chunks interleaved with encoded `values`, then close."""
+        length = 0
+        for i in range(0, len(parts), 2):
+            length += len(parts[i])
+        for v in values:
+            length += len(v)
+        if _DEBUG:
+            print("DEBUG: Sending response ({} bytes)".format(length))
+        try:
+            self._resp_off = 0
+            self._write(conn, _HDR_HTML % length)
+            if extra_headers:
+                self._write(conn, extra_headers.encode('utf-8'))
+            self._write(conn, _HDR_CLOSE)
+            for i in range(len(values)):
+                self._write(conn, parts[2 * i])
+                self._write(conn, values[i])
+            self._write(conn, parts[-1])
+            self._flush(conn)
+            if _DEBUG:
+                print("DEBUG: Response sent successfully")
+            return True
+        except Exception as e:
+            print("ERROR: Failed to send response: {}".format(e))
+            return False
+        finally:
+            conn.close()
+            gc.collect()
+            if _DEBUG:
+                print("DEBUG: Client connection closed")
 
     def _get_error_page(self, error_title, error_message, sensors, ac_monitor, heater_monitor):
-        """Generate error page with message."""
+        """Build error page (_ERROR_PARTS, encoded values) for _send_response to stream."""
         # Get current temps (cached, fast - no blocking sensor reads)
-        inside_temp = getattr(sensors.get('inside'), 'last_temp', None) or "N/A"
-        outside_temp = getattr(sensors.get('outside'), 'last_temp', None) or "N/A"
-        
-        # Format temperature values
-        inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-        outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
+        inside_temp_str = _sensor_fmt(sensors, 'inside')
+        outside_temp_str = _sensor_fmt(sensors, 'outside')
         
         # Get current statuses
-        ac_status = "ON" if ac_monitor and ac_monitor.ac.get_state() else "OFF"
-        heater_status = "ON" if heater_monitor and heater_monitor.heater.get_state() else "OFF"
-        
-        html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Error - Climate Control</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            max-width: 800px;
-            margin: 40px auto;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-        }}
-        .container {{
-            background: white;
-            border-radius: 15px;
-            padding: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }}
-        .error-banner {{
-            background: linear-gradient(135deg, #e74c3c, #c0392b);
-            color: white;
-            padding: 20px;
-            border-radius: 10px;
-            text-align: center;
-            font-weight: bold;
-            margin-bottom: 20px;
-            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
-        }}
-        .error-title {{
-            font-size: 24px;
-            margin-bottom: 10px;
-        }}
-        .error-message {{
-            font-size: 16px;
-            line-height: 1.5;
-        }}
-        .btn {{
-            background: linear-gradient(135deg, #3498db, #2980b9);
-            color: white;
-            padding: 12px 24px;
-            border: none;
-            border-radius: 8px;
-            cursor: pointer;
-            font-size: 16px;
-            font-weight: bold;
-            text-decoration: none;
-            display: inline-block;
-            margin-top: 20px;
-        }}
-        .btn:hover {{
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(52, 152, 219, 0.4);
-        }}
-        .status-grid {{
-            display: grid;
-            grid-template-columns: repeat(2, 1fr);
-            gap: 15px;
-            margin-top: 20px;
-        }}
-        .status-card {{
-            background: #f8f9fa;
-            padding: 15px;
-            border-radius: 8px;
-            text-align: center;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <div class="error-banner">
-            <div class="error-title">❌ {error_title}</div>
-            <div class="error-message">{error_message}</div>
-        </div>
-        
-        <div class="status-grid">
-            <div class="status-card">
-                <div style="font-size: 14px; color: #7f8c8d; margin-bottom: 5px;">🏠 Inside</div>
-                <div style="font-size: 24px; font-weight: bold; color: #2c3e50;">{inside_temp}°F</div>
-            </div>
-            <div class="status-card">
-                <div style="font-size: 14px; color: #7f8c8d; margin-bottom: 5px;">🌡️ Outside</div>
-                <div style="font-size: 24px; font-weight: bold; color: #2c3e50;">{outside_temp}°F</div>
-            </div>
-            <div class="status-card">
-                <div style="font-size: 14px; color: #7f8c8d; margin-bottom: 5px;">🔥 Heater</div>
-                <div style="font-size: 24px; font-weight: bold; color: #2c3e50;">{heater_status}</div>
-            </div>
-            <div class="status-card">
-                <div style="font-size: 14px; color: #7f8c8d; margin-bottom: 5px;">❄️ AC</div>
-                <div style="font-size: 24px; font-weight: bold; color: #2c3e50;">{ac_status}</div>
-            </div>
-        </div>
+        heater_on, ac_on = _relay_states(ac_monitor, heater_monitor)
+        ac_status = _STATE_STR[ac_on]
+        heater_status = _STATE_STR[heater_on]
         
-        <div style="text-align: center;">
-            <a href="/" class="btn">⬅️ Go Back</a>
-        </div>
-    </div>
-</body>
-</html>
-        """.format(
-            error_title=error_title,
-            error_message=error_message,
-            inside_temp=inside_temp_str,
-            outside_temp=outside_temp_str,
-            heater_status=heater_status,
-            ac_status=ac_status
-        )
+        cards = "".join(_CARD_FMT % card for card in (
+            ("🏠 Inside", inside_temp_str + "°F"),
+            ("🌡️ Outside", outside_temp_str + "°F"),
+            ("🔥 Heater", heater_status),
+            ("❄️ AC", ac_status)
+        ))
         
-        return html
+        return _ERROR_PARTS, _slot_values(_ERROR_PARTS, {'title': _html_escape(error_title), 'message': _html_escape(error_message), 'cards': cards})
 
-    def _get_schedule_editor_page(self, sensors, ac_monitor, heater_monitor):
-        """Generate schedule editor page (no auto-refresh, schedules only)."""
+    def _get_schedule_editor_page(self, conn, sensors, ac_monitor, heater_monitor):
+        """Stream schedule editor page to conn (no auto-refresh, schedules only)."""
         # Get current temps (read if not cached)
-        import gc  # type: ignore
-        gc.collect()
-        inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
-        if inside_temp is None:
-            inside_temps = sensors['inside'].read_all_temps(unit='F')
-            inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
-        
-        outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
-        if outside_temp is None:
-            outside_temps = sensors['outside'].read_all_temps(unit='F')
-            outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
+        inside_temp, outside_temp = self._current_temps(sensors)
         
         # Format temperature values
-        inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-        outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
+        inside_temp_str = _fmt_temp(inside_temp)
+        outside_temp_str = _fmt_temp(outside_temp)
         
         # Load config
         config = self._load_config()
+        schedule_inputs = self._build_schedule_form(config)
+        
+        self._send_parts(conn, _SCHED_EDITOR_PARTS, _slot_values(_SCHED_EDITOR_PARTS, {
+            'inside_temp': inside_temp_str,
+            'outside_temp': outside_temp_str,
+            'schedule_inputs': schedule_inputs
+        }))
+
+    def _build_schedule_form(self, config):
+        """Build the 4 schedule input rows (memoized until schedules or defaults change)."""
         schedules = config.get('schedules', [])
+        # Same check as the dashboard cards: a reload makes a new list, a save bumps _config_rev
+        key = (self._config_rev, config.get('ac_target'), config.get('heater_target'))
+        cached = self._sched_form_cache
+        if cached and cached[0] is schedules and cached[1] == key:
+            return cached[2]
         
-        # Pad with empty schedules up to 4
-        while len(schedules) < 4:
-            schedules.append({
-                'time': '',
-                'name': '',
-                'ac_target': config.get('ac_target', 75.0),      # default if not set
-                'heater_target': config.get('heater_target', 72.0)  # default if not set
-            })
+        n = len(schedules)
 
         # ===== DEBUG: Verify we have 4 schedules =====
-        print("DEBUG: Schedule editor will render {} schedules:".format(len(schedules[:4])))
-        for i, s in enumerate(schedules[:4]):
-            print("  Schedule {}: time='{}', name='{}', heater={}, ac={}".format(
-                i, s.get('time', '(empty)'), s.get('name', '(empty)'),
-                s.get('heater_target', 'N/A'), s.get('ac_target', 'N/A')
-            ))
+        if _DEBUG:
+            print("DEBUG: Schedule editor will render 4 schedules ({} configured)".format(n))
         # ===== END DEBUG =====
 
-        # Build schedule inputs
-        schedule_inputs = ""
-        for i, schedule in enumerate(schedules[:4]):
+        # Build schedule inputs (one cached fragment per row, joined once). Rows past the configured
+        # schedules read the shared empty schedule (never mutated); its targets use the config defaults
+        heater_default = config.get('heater_target', 72.0)
+        ac_default = config.get('ac_target', 75.0)
+        rows = []
+        for i in range(4):
+            schedule = schedules[i] if i < n else _EMPTY_SCHEDULE
             time_value = schedule.get('time', '')
             name_value = schedule.get('name', '')
-            heater_value = schedule.get('heater_target', config.get('heater_target'))
-            ac_value = schedule.get('ac_target', config.get('ac_target'))
-            
-            print("DEBUG:   Values: time='{}', name='{}', heater={}, ac={}".format(
-                time_value, name_value, heater_value, ac_value))
-            
-            # Build HTML - MINIMAL VERSION with hidden markers
-            schedule_inputs += '<div class="sched">\n'
-            schedule_inputs += '<h3>Schedule ' + str(i+1) + '</h3>\n'
-            
-            # Hidden input to mark this schedule exists (always sent)
-            schedule_inputs += '<input type="hidden" name="schedule_' + str(i) + '_exists" value="1">\n'
-            # Hidden marker to record which input was changed last for this row
-            schedule_inputs += '<input type="hidden" name="schedule_' + str(i) + '_last_changed" id="schedule_' + str(i) + '_last_changed" value="">\n'
-
-            schedule_inputs += '<label>Time</label>\n'
-            schedule_inputs += '<input type="time" name="schedule_' + str(i) + '_time" value="' + str(time_value) + '">\n'
-            schedule_inputs += '<label>Name</label>\n'
-            schedule_inputs += '<input type="text" name="schedule_' + str(i) + '_name" value="' + str(name_value) + '" placeholder="Schedule ' + str(i+1) + '">\n'
-            schedule_inputs += '<label>Heater (°F)</label>\n'
-            # Add required attribute to force validation
-            schedule_inputs += "<input type=\"number\" name=\"schedule_" + str(i) + "_heater\" value=\"" + str(heater_value) + "\" step=\"0.5\" min=\"60\" max=\"85\" required oninput=\"schedSync(" + str(i) + ", 'heater')\" onchange=\"schedSync(" + str(i) + ", 'heater')\">\n"
-            schedule_inputs += '<label>AC (°F)</label>\n'
-            # Add required attribute to force validation
-            schedule_inputs += "<input type=\"number\" name=\"schedule_" + str(i) + "_ac\" value=\"" + str(ac_value) + "\" step=\"0.5\" min=\"60\" max=\"90\" required oninput=\"schedSync(" + str(i) + ", 'ac')\" onchange=\"schedSync(" + str(i) + ", 'ac')\">\n"
-            schedule_inputs += '</div>\n'
-        
-        html = """
-    <!DOCTYPE html>
-    <html>
-    <head>
-        <title>Schedule Editor - Climate Control</title>
-        <meta name="viewport" content="width=device-width, initial-scale=1">
-        <meta charset="utf-8">
-        <style>
-            .sched {{
-                background: #f8f9fa;
-                padding: 20px;
-                border-radius: 10px;
-                margin-bottom: 15px;
-                border: 2px solid #ddd;
-            }}
-            .sched h3 {{
-                color: #34495e;
-                margin-bottom: 15px;
-            }}
-            .sched label {{
-                display: block;
-                margin: 10px 0 5px 0;
-                font-weight: bold;
-                color: #555;
-            }}
-            .sched input {{
-                width: 100%;
-                padding: 8px;
-                border: 1px solid #ddd;
-                border-radius: 4px;
-                margin-bottom: 10px;
-            }}
-            body {{
-                font-family: Arial, sans-serif;
-                max-width: 1000px;
-                margin: 0 auto;
-                padding: 20px;
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                min-height: 100vh;
-            }}
-            .container {{
-                background: white;
-                border-radius: 15px;
-                padding: 30px;
-                box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-            }}
-            h1 {{
-                color: #2c3e50;
-                text-align: center;
-                margin-bottom: 20px;
-            }}
-            .header-info {{
-                display: flex;
-                justify-content: center;
-                gap: 30px;
-                margin-bottom: 30px;
-                padding: 15px;
-                background: #f8f9fa;
-                border-radius: 10px;
-            }}
-            .btn {{
-                padding: 12px 24px;
-                background: linear-gradient(135deg, #667eea, #764ba2);
-                color: white;
-                border: none;
-                border-radius: 8px;
-                font-weight: bold;
-                cursor: pointer;
-                font-size: 16px;
-                text-decoration: none;
-                display: inline-block;
-            }}
-            .btn:hover {{ transform: translateY(-2px); }}
-        </style>
-        
-    </head>
-    <body>
-        <div class="container">
-            <h1>📅 Schedule Configuration</h1>
-            
-            <div class="header-info">
-                <div>🏠 Inside: <strong>{inside_temp}°F</strong></div>
-                <div>🌡️ Outside: <strong>{outside_temp}°F</strong></div>
-            </div>
-            
-            <form method="POST" action="/schedule">
-                <h3 style="color: #34495e; margin-bottom: 15px;">⏰ Configure Schedule Times & Temperatures</h3>
-                <p style="color: #7f8c8d; margin-bottom: 20px;">
-                    Set up to 4 time-based schedules. Leave time blank to disable a schedule.
-                </p>
-                
-                {schedule_inputs}
-                
-                <div style="margin-top: 20px;">
-                    <button type="submit" name="mode_action" value="save_schedules" class="btn" style="width: 100%;">
-                        💾 Save Schedule Configuration
-                    </button>
-                </div>
-            </form>
+            heater_value = schedule.get('heater_target', heater_default)
+            ac_value = schedule.get('ac_target', ac_default)
             
-            <div style="text-align: center; margin-top: 20px;">
-                <a href="/" class="btn" style="background: linear-gradient(135deg, #95a5a6, #7f8c8d);">
-                    ⬅️ Back to Dashboard
-                </a>
-            </div>
+            if _DEBUG:
+                print("DEBUG:   Values: time='{}', name='{}', heater={}, ac={}".format(
+                    time_value, name_value, heater_value, ac_value))
             
-            <div style="text-align: center; color: #7f8c8d; margin-top: 20px; padding-top: 20px; border-top: 2px solid #ecf0f1;">
-                💡 This page does not auto-refresh<br>
-                To change modes (Automatic/Hold), return to the dashboard
-            </div>
-        </div>
-<script defer src="/sched.js"></script>
-    </body>
-    </html>
-        """.format(
-            inside_temp=inside_temp_str,
-            outside_temp=outside_temp_str,
-            schedule_inputs=schedule_inputs
-        )
+            rows.append(self._render_row(i, time_value, name_value, heater_value, ac_value))
+        schedule_inputs = b''.join(rows)
         
-        return html
+        self._sched_form_cache = (schedules, key, schedule_inputs)
+        return schedule_inputs
 
-    def _build_mode_buttons(self, config):
-        """Build mode control buttons for dashboard only."""
-        schedules = config.get('schedules', [])
-        has_schedules = len([s for s in schedules if s.get('time')]) > 0
-        
-        if not has_schedules:
-            return """
-            <div style="background: #f8f9fa; padding: 15px; border-radius: 8px; text-align: center; color: #7f8c8d; margin: 20px 0;">
-                ℹ️ No schedules configured - <a href="/schedule" style="color: #667eea; font-weight: bold;">Configure schedules</a>
-            </div>
-            """
-        
-        # Build mode buttons based on current state
-        if config.get('schedule_enabled'):
-            # ===== NEW: Find active schedule =====
-            active_schedule_name = "None"
-            current_time = time.localtime()
-            current_minutes = current_time[3] * 60 + current_time[4]
-            
-            # Sort schedules by time and find the active one
-            sorted_schedules = []
+    def _render_row(self, i, time_value, name_value, heater_value, ac_value):
+        """Return the encoded schedule editor row i, reusing the fragment if its values are unchanged."""
+        key = (i, time_value, name_value, heater_value, ac_value)
+        row = self._row_cache.get(key)
+        if row is None:
+            if len(self._row_cache) >= 16:
+                self._row_cache.clear()  # Bounded: 4 rows x a few recent edits is plenty
+            # Escaped: the values land inside value="..." attributes
+            row = _render(_SCHED_ROWS[i], {
+                'time': _html_escape(str(time_value)), 'name': _html_escape(str(name_value)),
+                'heater': _html_escape(str(heater_value)), 'ac': _html_escape(str(ac_value))
+            })
+            self._row_cache[key] = row
+        return row
+
+    def _build_mode_buttons(self, config, mode):
+        """Return the encoded mode control block for _sched_mode() `mode`."""
+        if mode != _MODE_AUTO:
+            return _MODE_HTML[mode]
+        return _render(_AUTO_MODE_PARTS, {'name': _html_escape(str(self._active_schedule_name(config.get('schedules', []))))})
+    
+    def _schedule_minutes(self, schedules):
+        """((start minute of day, schedule), ...) for schedules with a valid time, parsed once per config.
+
+        Kept beside the config rather than in the schedule dicts, which are saved to config.json as-is.
+        """
+        cached_schedules, cached_rev, parsed = self._minutes_cache
+        if cached_schedules is not schedules or cached_rev != self._config_rev:
+            out = []
             for schedule in schedules:
                 if schedule.get('time'):
                     try:
                         time_parts = schedule['time'].split(':')
-                        schedule_minutes = int(time_parts[0]) * 60 + int(time_parts[1])
-                        sorted_schedules.append((schedule_minutes, schedule))
+                        out.append((int(time_parts[0]) * 60 + int(time_parts[1]), schedule))
                     except:
                         pass
-            
-            sorted_schedules.sort()
-            
-            # Find most recent schedule that has passed
-            for schedule_minutes, schedule in sorted_schedules:
-                if current_minutes >= schedule_minutes:
-                    active_schedule_name = schedule.get('name', 'Unnamed')
-                else:
-                    break
-            
-            # If no schedule found (before first one), use last from yesterday
-            if active_schedule_name == "None" and sorted_schedules:
-                active_schedule_name = sorted_schedules[-1][1].get('name', 'Unnamed')
-            # ===== END: Find active schedule =====
-            
-            return """
-            <form method="POST" action="/schedule" style="margin: 20px 0;">
-                <div style="background: linear-gradient(135deg, #2ecc71, #27ae60); color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
-                    <div style="font-weight: bold; font-size: 18px; margin-bottom: 5px;">✅ Automatic Mode</div>
-                    <div style="font-size: 14px; opacity: 0.9; margin-bottom: 10px;">Currently running: <strong>{active_schedule}</strong></div>
-                    <div style="font-size: 13px; opacity: 0.8;">Temperatures adjust based on schedule</div>
-                </div>
-            </form>
-            """.format(active_schedule=active_schedule_name)
-        elif config.get('permanent_hold', False):
-            return """
-            <form method="POST" action="/schedule" style="margin: 20px 0;">
-                <div style="background: linear-gradient(135deg, #e74c3c, #c0392b); color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
-                    <div style="font-weight: bold; font-size: 18px; margin-bottom: 10px;">🛑 Permanent Hold</div>
-                    <div style="font-size: 14px; margin-bottom: 15px;">Manual control only - Schedules disabled</div>
-                    <div style="text-align: center;">
-                        <button type="submit" name="mode_action" value="resume" style="padding: 10px 20px; background: #2ecc71; color: white; border: none; border-radius: 6px; cursor: pointer; font-weight: bold;">▶️ Resume Scheduling</button>
-                    </div>
-                </div>
-            </form>
-            """
-        else:
-            return """
-            <form method="POST" action="/schedule" style="margin: 20px 0;">
-                <div style="background: linear-gradient(135deg, #f39c12, #e67e22); color: white; padding: 15px; border-radius: 10px; box-shadow: 0 4px 8px rgba(0,0,0,0.2);">
-                    <div style="font-weight: bold; font-size: 18px; margin-bottom: 10px;">⏸️ Temporary Hold</div>
-                    <div style="font-size: 14px; margin-bottom: 15px;">Manual override active</div>
-                    <div style="text-align: center;">
-                        <button type="submit" name="mode_action" value="resume" style="padding: 10px 20px; background: #2ecc71; color: white; border: none; border-radius: 6px; cursor: pointer; font-weight: bold;">▶️ Resume Scheduling</button>
-                    </div>
-                </div>
-            </form>
-            """
-    
-    def _get_settings_page(self, sensors, ac_monitor, heater_monitor):
-        """Generate advanced settings page."""
-        config = self._load_config()
-        import gc  # type: ignore
-        gc.collect()
-        # Get temperatures (read if not cached)
-        inside_temp = getattr(sensors.get('inside'), 'last_temp', None)
-        if inside_temp is None:
-            inside_temps = sensors['inside'].read_all_temps(unit='F')
-            inside_temp = list(inside_temps.values())[0] if inside_temps else "N/A"
-        
-        outside_temp = getattr(sensors.get('outside'), 'last_temp', None)
-        if outside_temp is None:
-            outside_temps = sensors['outside'].read_all_temps(unit='F')
-            outside_temp = list(outside_temps.values())[0] if outside_temps else "N/A"
-        
-        inside_temp_str = "{:.1f}".format(inside_temp) if isinstance(inside_temp, float) else str(inside_temp)
-        outside_temp_str = "{:.1f}".format(outside_temp) if isinstance(outside_temp, float) else str(outside_temp)
-        
-        html = """
-<!DOCTYPE html>
-<html>
-<head>
-    <title>Advanced Settings - Climate Control</title>
-    <meta name="viewport" content="width=device-width, initial-scale=1">
-    <meta charset="utf-8">
-    <style>
-        body {{
-            font-family: Arial, sans-serif;
-            max-width: 900px;
-            margin: 0 auto;
-            padding: 20px;
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{
-            background: white;
-            border-radius: 15px;
-            padding: 30px;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.3);
-        }}
-        h1 {{
-            color: #2c3e50;
-            text-align: center;
-            margin-bottom: 20px;
-        }}
-        .header-info {{
-            display: flex;
-            justify-content: center;
-            gap: 30px;
-            margin-bottom: 30px;
-            padding: 15px;
-            background: #f8f9fa;
-            border-radius: 10px;
-        }}
-        .setting-group {{
-            background: #f8f9fa;
-            padding: 20px;
-            border-radius: 10px;
-            margin-bottom: 20px;
-        }}
-        .setting-group h3 {{
-            color: #34495e;
-            margin-bottom: 15px;
-        }}
-        label {{
-            display: block;
-            margin: 15px 0 5px 0;
-            font-weight: bold;
-            color: #555;
-        }}
-        input[type="number"] {{
-            width: 100%;
-            padding: 10px;
-            border: 2px solid #ddd;
-            border-radius: 6px;
-            font-size: 16px;
-        }}
-        input[type="number"]:focus {{
-            border-color: #667eea;
-            outline: none;
-        }}
-        .btn {{
-            padding: 12px 24px;
-            background: linear-gradient(135deg, #667eea, #764ba2);
-            color: white;
-            border: none;
-            border-radius: 8px;
-            font-weight: bold;
-            cursor: pointer;
-            font-size: 16px;
-            text-decoration: none;
-            display: inline-block;
-            width: 100%;
-        }}
-        .btn:hover {{ transform: translateY(-2px); }}
-        .btn-secondary {{
-            background: linear-gradient(135deg, #95a5a6, #7f8c8d);
-            margin-top: 10px;
-        }}
-        .info-box {{
-            background: #e8f4f8;
-            border-left: 4px solid #3498db;
-            padding: 15px;
-            margin: 20px 0;
-            border-radius: 4px;
-        }}
-    </style>
-</head>
-<body>
-    <div class="container">
-        <h1>⚙️ Advanced Settings</h1>
+            parsed = tuple(out)
+            self._minutes_cache = (schedules, self._config_rev, parsed)
+        return parsed
+
+    def _active_schedule_name(self, schedules):
+        """Name of the schedule running now (the last one started today, else yesterday's last)."""
+        # ===== NEW: Find active schedule =====
+        current_time = time.localtime()
+        current_minutes = current_time[3] * 60 + current_time[4]
         
-        <div class="header-info">
-            <div>🏠 Inside: <strong>{inside_temp}°F</strong></div>
-            <div>🌡️ Outside: <strong>{outside_temp}°F</strong></div>
-        </div>
+        # One pass, no sorted copy: latest start at or before now, and the latest start overall
+        # (yesterday's last one is still running before today's first)
+        best_minutes, best = -1, None
+        last_minutes, last = -1, None
+        for schedule_minutes, schedule in self._schedule_minutes(schedules):
+            if best_minutes < schedule_minutes <= current_minutes:
+                best_minutes, best = schedule_minutes, schedule
+            if schedule_minutes > last_minutes:
+                last_minutes, last = schedule_minutes, schedule
         
-        <div class="info-box">
-            💡 <strong>Note:</strong> These settings control the tolerance ranges for automatic climate control. Changes take effect immediately.
-        </div>
+        active = best or last
+        active_schedule_name = active.get('name', 'Unnamed') if active else "None"
+        # ===== END: Find active schedule =====
         
-        <form method="POST" action="/settings">
-            <div class="setting-group">
-                <h3>🔥 Heating System</h3>
-                <label>Heater Swing (±°F)</label>
-                <input type="number" name="heater_swing" value="{heater_swing}" step="0.5" min="0.5" max="5" required>
-                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
-                    How many degrees below target before heater turns ON
-                </small>
-            </div>
-            
-            <div class="setting-group">
-                <h3>❄️ Air Conditioning</h3>
-                <label>AC Swing (±°F)</label>
-                <input type="number" name="ac_swing" value="{ac_swing}" step="0.5" min="0.5" max="5" required>
-                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
-                    How many degrees above target before AC turns ON
-                </small>
-            </div>
-            
-            <div class="setting-group">
-                <h3>⏱️ Hold Duration</h3>
-                <label>Temporary Hold Duration (minutes)</label>
-                <input type="number" name="temp_hold_duration" value="{temp_hold_mins}" step="1" min="1" max="1440" required>
-                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
-                    How long temporary holds last before auto-resuming (default: 60 min)
-                </small>
-            </div>
-            
-            <div class="setting-group">
-                <h3>🌐 Timezone</h3>
-                <label>UTC Offset (hours)</label>
-                <input type="number" name="timezone_offset" value="{timezone_offset}" step="1" min="-12" max="14" required>
-                <small style="color: #7f8c8d; display: block; margin-top: 5px;">
-                    CST=-6, CDT=-5, EST=-5, EDT=-4, MST=-7, PST=-8
-                </small>
-            </div>
-            
-            <button type="submit" class="btn">💾 Save Settings</button>
-        </form>
+        return active_schedule_name
+    
+    def _get_settings_page(self, conn, sensors, ac_monitor, heater_monitor):
+        """Stream advanced settings page to conn."""
+        config = self._load_config()
+        # Get temperatures (read if not cached)
+        inside_temp, outside_temp = self._current_temps(sensors)
         
-        <a href="/" class="btn btn-secondary" style="text-align: center;">⬅️ Back to Dashboard</a>
-    </div>
-</body>
-</html>
-        """.format(
-            inside_temp=inside_temp_str,
-            outside_temp=outside_temp_str,
-            heater_swing=config.get('heater_swing', 2.0),
-            ac_swing=config.get('ac_swing', 1.0),
-            temp_hold_mins=int(config.get('temp_hold_duration', 3600) / 60),
-            timezone_offset=config.get('timezone_offset', -6)
-        )
+        # Config-derived fields only change on a save: reuse them while the values match
+        key = (config.get('heater_swing', 2.0), config.get('ac_swing', 1.0),
+               config.get('temp_hold_duration', 3600), config.get('timezone_offset', -6))
+        cached_key, fields = self._settings_cache
+        if key != cached_key:
+            fields = {
+                'heater_swing': str(key[0]).encode('utf-8'),
+                'ac_swing': str(key[1]).encode('utf-8'),
+                'temp_hold_mins': str(int(key[2] / 60)).encode('utf-8'),
+                'timezone_offset': str(key[3]).encode('utf-8'),
+            }
+            self._settings_cache = (key, fields)
+        fields = dict(fields)  # Per-request temps stay out of the cached dict
+        fields['inside_temp'] = _fmt_temp(inside_temp)
+        fields['outside_temp'] = _fmt_temp(outside_temp)
         
-        return html
+        return self._send_parts(conn, _SETTINGS_PARTS, _slot_values(_SETTINGS_PARTS, fields))
 
-    def _handle_settings_update(self, request, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
-        """Handle advanced settings update."""
-        import gc  # type: ignore
+    def _handle_settings_update(self, form, sensors, ac_monitor, heater_monitor, schedule_monitor, config):
+        """Handle advanced settings update (list of (key, raw value) pairs)."""
         gc.collect()
         try:
-            body = request.split('\r\n\r\n')[1] if '\r\n\r\n' in request else ''
             params = {}
             
-            for pair in body.split('&'):
-                if '=' in pair:
-                    key, value = pair.split('=', 1)
-                    params[key] = float(value)
+            for key, value in form:
+                coerce = _SETTINGS_COERCE.get(key)
+                if coerce is None:
+                    continue
+                v = coerce(value)
+                if v is None:
+                    print("Ignoring invalid {}: {}".format(key, value))
+                else:
+                    params[key] = v
             
             # Update swing settings
             if 'ac_swing' in params:
@@ -1820,47 +2387,32 @@ document.addEventListener('DOMContentLoaded', function() {{
             
             # Update hold duration (convert minutes to seconds)
             if 'temp_hold_duration' in params:
-                duration_seconds = int(params['temp_hold_duration'] * 60)
+                duration_seconds = params['temp_hold_duration'] * 60
                 config['temp_hold_duration'] = duration_seconds
                 if schedule_monitor:
                     schedule_monitor.temp_hold_duration = duration_seconds
-                print("Temp hold duration updated to {} minutes".format(int(params['temp_hold_duration'])))
+                print("Temp hold duration updated to {} minutes".format(params['temp_hold_duration']))
             
             # Update timezone offset
             if 'timezone_offset' in params:
-                config['timezone_offset'] = int(params['timezone_offset'])
-                print("Timezone offset updated to UTC{:+d}".format(int(params['timezone_offset'])))
+                config['timezone_offset'] = params['timezone_offset']
+                print("Timezone offset updated to UTC{:+d}".format(params['timezone_offset']))
             
-            # Save to file
+            # Save to file (config is the dict just written - no need to read it back from flash)
             if self._save_config_to_file(config):
                 print("Advanced settings saved")
-                
-                # Reload config
-                try:
-                    with open('config.json', 'r') as f:
-                        updated_config = json.load(f)
-                        config.clear()
-                        config.update(updated_config)
-                    print("✅ Config reloaded")
-                except Exception as e:
-                    print("⚠️ Could not reload: {}".format(e))
             
             # Discord notification
             try:
-                discord_webhook.send_discord_message("⚙️ Advanced settings updated")
+                self._discord_queue.append("⚙️ Advanced settings updated")
             except:
                 pass
             
         except Exception as e:
             print("Error updating settings: {}".format(e))
-            import sys
-            sys.print_exception(e)
+            if self.DEBUG_TRACEBACKS:
+                sys.print_exception(e)
         
         # Redirect to dashboard
-        redirect_response = 'HTTP/1.1 303 See Other\r\n'
-        redirect_response += 'Location: /\r\n'
-        redirect_response += 'Content-Length: 0\r\n'
-        redirect_response += 'Connection: close\r\n'
-        redirect_response += '\r\n'
         gc.collect()
-        return redirect_response
\ No newline at end of file
+        return _REDIRECT_303_ROOT
\ No newline at end of file
@@ -0,0 +1,292 @@
+"""Desk tests for Scripts/web_server.py under CPython (run: python -m unittest discover -s tests)."""
+import os
+import sys
+import tempfile
+import time
+import types
+import unittest
+
+# The firmware imports the modules as scripts.*; map that package onto the Scripts folder
+_SCRIPTS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'Scripts')
+if 'scripts' not in sys.modules:
+    _pkg = types.ModuleType('scripts')
+    _pkg.__path__ = [_SCRIPTS]
+    sys.modules['scripts'] = _pkg
+
+# MicroPython time functions the server uses
+if not hasattr(time, 'ticks_ms'):
+    time.ticks_ms = lambda: int(time.time() * 1000)
+    time.ticks_diff = lambda a, b: a - b
+
+from scripts.web_server import TempWebServer, _RECV_MAX, _BAD_REQUEST, _PAYLOAD_TOO_LARGE  # noqa: E402
+
+
+class _Poll:
+    """select.poll() stand-in: ready while the connection still has data."""
+    def __init__(self, conn=None):
+        self.conn = conn
+
+    def register(self, obj, mask):
+        pass
+
+    def unregister(self, obj):
+        pass
+
+    def poll(self, timeout):
+        return [(self.conn, 1)] if self.conn is None or self.conn.chunks else []
+
+
+class _Conn:
+    """Client socket stand-in (MicroPython readinto API); one TCP segment arrives per arrive() call."""
+    def __init__(self, data, chunk=1460):
+        self.segments = [data[i:i + chunk] for i in range(0, len(data), chunk)]
+        self.chunks = []
+        self.out = b''
+        self.blocking = True
+
+    def arrive(self):
+        if self.segments:
+            self.chunks.append(self.segments.pop(0))
+
+    def readinto(self, mv):
+        if not self.chunks:
+            return None
+        c = self.chunks.pop(0)
+        n = min(len(c), len(mv))
+        mv[:n] = c[:n]
+        if n < len(c):
+            self.chunks.insert(0, c[n:])
+        return n
+
+    def sendall(self, data):
+        if not self.blocking:
+            raise OSError(11)  # EAGAIN: nothing queued yet, so a non-blocking send fails here
+        self.out += bytes(data)
+
+    def send(self, data):
+        self.sendall(data)
+        return len(data)
+
+    def write(self, data):
+        return self.send(data)
+
+    def setsockopt(self, *args):
+        pass
+
+    def setblocking(self, flag):
+        self.blocking = flag
+
+    def settimeout(self, t):
+        self.blocking = t is None or t > 0
+
+    def close(self):
+        pass
+
+
+class _Listener:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def accept(self):
+        return self.conn, ('127.0.0.1', 1)
+
+
+class _ServerTest(unittest.TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)  # Handlers read and write ./config.json
+        with open('config.json', 'w') as f:
+            f.write('{"ac_swing": 1.0, "heater_swing": 2.0, "schedules": []}')
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def _request(self, srv, raw):
+        conn = _Conn(raw)
+        srv.socket = _Listener(conn)
+        srv._accept_poller = _Poll()
+        srv._poller = _Poll(conn)
+        config = srv._load_config()
+        for _ in range(20):
+            conn.arrive()
+            srv.check_requests({}, None, None, None, config)
+            if srv._pending is None:
+                break
+        return conn.out
+
+
+class RecvBufferTest(_ServerTest):
+    def test_large_post_grows_buffer_to_exact_size(self):
+        srv = TempWebServer()
+        body = b'ac_swing=1.5&pad=' + b'x' * 5000
+        head = b'POST /settings HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body)
+        need = len(head) + len(body)
+        self.assertTrue(len(srv._recv_buf) < need <= _RECV_MAX)
+
+        out = self._request(srv, head + body)
+
+        self.assertTrue(out.startswith(b'HTTP/1.1 303'))
+        self.assertEqual(len(srv._recv_buf), need)
+        self.assertEqual(srv._load_config()['ac_swing'], 1.5)
+
+
+class EarlyAnswerTest(_ServerTest):
+    def test_rejections_are_sent_in_blocking_mode(self):
+        cases = (
+            (b'POST /settings HTTP/1.1\r\nContent-Length: x\r\n\r\n', _BAD_REQUEST),
+            (b'POST /settings HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % (_RECV_MAX + 1), _PAYLOAD_TOO_LARGE),
+            (b'GET / HTTP/1.1\r\nX: ' + b'x' * _RECV_MAX, _PAYLOAD_TOO_LARGE),
+        )
+        for raw, expected in cases:
+            self.assertEqual(self._request(TempWebServer(), raw), expected, raw[:40])
+
+
+class ScheduleNameTest(_ServerTest):
+    def test_plus_in_saved_name_survives_reload(self):
+        srv = TempWebServer()
+        body = (b'schedule_0_time=06%3A30&schedule_0_name=Heat%2BCool&schedule_0_ac=76'
+                b'&schedule_0_heater=71&mode_action=save_schedules')
+        out = self._request(srv, b'POST /schedule HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+        self.assertTrue(out.startswith(b'HTTP/1.1 303'))
+
+        for _ in range(2):  # Fresh server (reboot) re-reads config.json, then saves it again
+            srv = TempWebServer()
+            config = srv._load_config()
+            self.assertEqual(config['schedules'][0]['name'], 'Heat+Cool')
+            srv._save_config_to_file(config)
+
+    def test_legacy_encoded_name_is_decoded_once(self):
+        with open('config.json', 'w') as f:
+            f.write('{"schedules": [{"time": "06%3A30", "name": "Wake+up"}]}')
+        srv = TempWebServer()
+        config = srv._load_config()
+        self.assertEqual(config['schedules'][0], {'time': '06:30', 'name': 'Wake up'})
+        srv._save_config_to_file(config)
+        self.assertEqual(TempWebServer()._load_config()['schedules'][0]['name'], 'Wake up')
+
+
+class ScheduleTargetTest(_ServerTest):
+    def test_nan_and_out_of_range_targets_are_rejected(self):
+        for ac, heater in ((b'76', b'nan'), (b'inf', b'71'), (b'76', b'1e3'), (b'95', b'71'), (b'76', b'40')):
+            srv = TempWebServer()
+            body = (b'schedule_0_time=06%3A30&schedule_0_name=Wake&schedule_0_ac=' + ac +
+                    b'&schedule_0_heater=' + heater + b'&mode_action=save_schedules')
+            out = self._request(srv, b'POST /schedule HTTP/1.1\r\nContent-Length: %d\r\n\r\n' % len(body) + body)
+            self.assertTrue(out.startswith(b'HTTP/1.1 200') and b'Invalid Temperature' in out, (ac, heater))
+            self.assertEqual(srv._load_config()['schedules'], [])
+
+
+class _Sensor:
+    """TemperatureSensor stand-in that counts bus reads."""
+    def __init__(self, temp):
+        self.temp = temp
+        self.last_temp = None
+        self.reads = 0
+
+    def read_all_temps(self, unit='F'):
+        self.reads += 1
+        return {'28ff': self.temp}
+
+
+class _Relay:
+    def __init__(self, on):
+        self.on = on
+
+    def get_state(self):
+        return self.on
+
+
+class _Monitor:
+    def __init__(self, target, swing, on):
+        self.target_temp = target
+        self.temp_swing = swing
+        self.ac = self.heater = _Relay(on)
+
+
+class _DeadSensor(_Sensor):
+    def read_all_temps(self, unit='F'):
+        raise OSError(5)  # Bus error
+
+
+class _MonitoredTest(_ServerTest):
+    def _call(self, srv, raw):
+        """One-segment request with self.sensors and AC (on) / heater (off) monitors."""
+        conn = _Conn(raw)
+        conn.arrive()
+        srv.socket = _Listener(conn)
+        srv._accept_poller = _Poll()
+        srv._poller = _Poll(conn)
+        srv.check_requests(self.sensors, _Monitor(77.0, 1.0, 1), _Monitor(72.0, 2.0, 0), None, srv._load_config())
+        return conn.out
+
+
+class HeadTest(_MonitoredTest):
+
+    def test_head_sends_get_headers_without_rendering(self):
+        srv = TempWebServer()
+        for path in (b'/', b'/schedule', b'/settings', b'/state.json', b'/sched.js', b'/style.css', b'/nope'):
+            self.sensors = {'inside': _Sensor(71.0), 'outside': _Sensor(55.0)}
+            head = self._call(srv, b'HEAD ' + path + b' HTTP/1.1\r\n\r\n')
+            self.assertEqual(self.sensors['inside'].reads + self.sensors['outside'].reads, 0, path)
+            get = self._call(srv, b'GET ' + path + b' HTTP/1.1\r\n\r\n')
+            end = get.find(b'\r\n\r\n') + 4
+            self.assertTrue(get.startswith(b'HTTP/1.1 200 OK\r\n') and len(get) > end, path)
+
+            self.assertTrue(head.startswith(b'HTTP/1.1 200 OK\r\n'), path)
+            self.assertTrue(head.endswith(b'\r\n\r\n') and head.count(b'\r\n\r\n') == 1, path)  # No body
+            get_headers = get[:end].split(b'\r\n')
+            for line in head.split(b'\r\n'):
+                self.assertIn(line, get_headers, path)  # GET's headers (minus length/ETag of generated pages)
+            ctype = [h for h in get_headers if h.startswith(b'Content-Type:')]
+            self.assertEqual(ctype, [h for h in head.split(b'\r\n') if h.startswith(b'Content-Type:')], path)
+
+
+
+class DashboardFallbackTest(_MonitoredTest):
+    def test_sensor_error_serves_fallback_page(self):
+        self.sensors = {'inside': _DeadSensor(71.0), 'outside': _Sensor(55.0)}
+        out = self._call(TempWebServer(), b'GET / HTTP/1.1\r\n\r\n')
+        self.assertTrue(out.startswith(b'HTTP/1.1 200 OK\r\n'))
+        self.assertIn(b'<h1>Error loading page</h1>', out)
+
+
+
+class TempHoldCacheTest(_MonitoredTest):
+    def setUp(self):
+        super().setUp()
+        self.now = 1700000040.0 + 5  # 5 s into a minute
+        self._time = time.time
+        time.time = lambda: self.now
+        self.sensors = {'inside': _Sensor(71.0), 'outside': _Sensor(55.0)}
+
+    def tearDown(self):
+        time.time = self._time
+        super().tearDown()
+
+    def _hold(self, started_ago):
+        with open('config.json', 'w') as f:
+            f.write('{"schedule_enabled": false, "permanent_hold": false, "temp_hold_duration": 3600, '
+                    '"temp_hold_start_time": %r, "schedules": [{"time": "06:00", "name": "Wake"}]}'
+                    % (self.now - started_ago))
+
+    def test_countdown_reuses_page_within_the_minute(self):
+        self._hold(100)
+        srv = TempWebServer()
+        self.assertIn(b' - 58 min remaining', self._call(srv, b'GET / HTTP/1.1\r\n\r\n'))
+        values = srv._page_cache[0]
+        self.now += 1
+        self.assertIn(b' - 58 min remaining', self._call(srv, b'GET / HTTP/1.1\r\n\r\n'))
+        self.assertTrue(srv._page_cache[0] is values, 'page values rebuilt')
+
+    def test_last_minute_counts_seconds(self):
+        self._hold(3590)
+        srv = TempWebServer()
+        self.assertIn(b' - 10s remaining', self._call(srv, b'GET / HTTP/1.1\r\n\r\n'))
+        self.now += 1
+        self.assertIn(b' - 9s remaining', self._call(srv, b'GET / HTTP/1.1\r\n\r\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()